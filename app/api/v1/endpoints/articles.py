@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Literal, Optional
 
+from app.core.conditional import Validators
+from app.core.exceptions import InvalidCursorError
 from app.crud import crud_article
-from app.dependencies import get_current_superuser, get_current_user, get_db
+from app.dependencies import get_async_db, get_current_superuser, get_current_user, get_db
 from app.models import user as models_user
 from app.schemas.article import Article, ArticleCreate, ArticleUpdate
 
@@ -21,28 +24,60 @@ def create_article(
     db_article = crud_article.get_article(db, slug= article.slug)
     if db_article:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Article with this slug already exixts")
-    return crud_article.create_article(db, article, int(current_user.id))
+    try:
+        return crud_article.create_article(db, article, int(current_user.id))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
 
 @router.get("/", response_model=list[Article])
-def read_articles(
+async def read_articles(
+        request: Request,
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
-        serach: Optional[str] = Query(None, description="Search in title and content"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
+        search: Optional[str] = Query(None, description="Full-text search in title, excerpt and content; "
+                                                        "results are ranked by relevance and paged with skip"),
+        serach: Optional[str] = Query(None, deprecated=True, description="Misspelled alias of search"),
         status: Optional[str] = Query("published", description="Filter by status"),
         type: Optional[str] = Query(None, description="Filter by article type"),
         category: Optional[str] = Query(None, description="Filter by category_slug"),
-        featured: Optional[bool] = Query(None, description="Filter featured articles"),
-        sort_by: Optional[str] = Query("published_at", description="Sort by field"),
-        sort_order: Optional[str] = Query("desc", description="Sort order (asc/desc)"),
-        db: Session = Depends(get_db)
+        featured: Optional[bool] = Query(None, deprecated=True,
+                                         description="Not supported: articles have no featured flag; ignored"),
+        sort_by: Literal["published_at", "created_at"] = Query(
+            "published_at", description="Sort by field; published_at leaves out never-published articles"),
+        sort_order: Literal["asc", "desc"] = Query("desc", description="Sort order"),
+        db: AsyncSession = Depends(get_async_db)
 ):
-    articles = crud_article.get_articles(
+    """List articles; a 304 for an unchanged page costs one narrow query."""
+    filters = {"status": status, "type": type, "category": category}
+    search = search or serach
+    if search:
+        if cursor:
+            raise InvalidCursorError("Search results are ordered by relevance; page them with skip instead of cursor")
+        return await crud_article.search_articles_async(db, search, skip=skip, limit=limit, **filters)
+
+    ordering = {"sort_by": sort_by, "descending": sort_order == "desc"}
+    # The ETag covers every row of the page (and whether another page follows)
+    versions = await crud_article.get_article_page_versions_async(
+        db, skip=skip, limit=limit, cursor=cursor, **filters, **ordering)
+    validators = Validators.from_versions(versions, last_modified=False)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+
+    page = await crud_article.get_articles_async(
         db=db,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        **filters,
+        **ordering,
     )
-    return articles
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    validators.apply(response)
+    return page.items
 
 @router.put("/{slug}", response_model=Article)
 def update_article(
@@ -59,7 +94,10 @@ def update_article(
     if not current_user.is_superuser and db_article.author_id != int(current_user.id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this article")
 
-    return crud_article.update_article(db, db_article, article_update)
+    try:
+        return crud_article.update_article(db, db_article, article_update)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
 
 @router.delete("/{slug}", status_code=status.HTTP_204_NO_CONTENT)
@@ -3,13 +3,16 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.functions import current_user
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.core.exceptions import TokenExpiredError
 from app.core.security import (
     create_tokens,
+    password_hasher,
+    principal_cache,
     send_email,
     token_blacklist,
     validate_password_complexity,
@@ -28,11 +31,11 @@ router = APIRouter()
 @router.post("/token", response_model=schemas_user.Token, dependencies=[Depends(rate_limiter)])
 async def login_for_access_token(
         form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
 ):
     """OAuth2 token endpoint for user login."""
-    user = crud.get_user_by_email(db, email=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await crud.get_user_by_email_async(db, email=form_data.username)
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -51,12 +54,11 @@ async def login_for_access_token(
         }
     )
     user.refresh_token = refresh_token
-    db.add(user)
-    db.commit()
+    await db.commit()
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 @router.post("/register", response_model=schemas_user.User)
-async def register(
+def register(
         user_in: schemas_user.UserCreate,
         db: Session = Depends(get_db),
 ):
@@ -153,7 +155,7 @@ def update_user_profile(
 async def refresh_access_token(
         refresh_date: schemas_user.RefreshTokenRequest,
         token: Annotated[str, Depends(reusable_oauth2)],
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         current_user: models_user.User = Depends(get_current_active_user)
 ):
     """Refresh the access token for an authenticated user."""
@@ -163,22 +165,19 @@ async def refresh_access_token(
     access_token, refresh_token = create_tokens(
         {"sub": current_user.email, "roles": current_user.roles, "is_superuser": current_user.is_superuser}
     )
-    current_user.refresh_token = refresh_token   # type: ignore[assignment]
-    db.add(current_user)
-    db.commit()
+    await crud.set_refresh_token_async(db, int(current_user.id), refresh_token)
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 @router.post("/logout")
 async def logout(
         token: Annotated[str, Depends(reusable_oauth2)],
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         current_user: models_user.User = Depends(get_current_active_user)
 ):
     """Revoke the current user's tokens."""
     payload = verify_token(token)
     exp = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
     token_blacklist.add_to_blacklist(payload.get("jti", ""), exp)
-    current_user.refresh_token = None   # type: ignore[assignment]
-    db.add(current_user)
-    db.commit()
+    principal_cache.invalidate(payload["sub"])
+    await crud.set_refresh_token_async(db, int(current_user.id), None)
     return {"message": "Logout successful"}
\ No newline at end of file
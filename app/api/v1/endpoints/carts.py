@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.crud import crud_cart,crud_product
-from app.dependencies import get_current_user, get_db
+from app.crud import crud_cart
+from app.dependencies import get_async_db, get_current_user, get_db
 from app.models import user as models_user
 from app.schemas.cart import Cart, CartCreate
 from app.schemas.cart_item import CartItem, CartItemCreate, CartItemUpdate
@@ -11,36 +12,38 @@ from app.schemas.cart_item import CartItem, CartItemCreate, CartItemUpdate
 router = APIRouter()
 
 @router.get("/me", response_model=Cart)
-def read_my_cart(db: Session = Depends(get_db), current_user: models_user.User = Depends(get_current_user)):
-    cart = crud_cart.get_cart_by_user_id(db, user_id=int(current_user.id))
+async def read_my_cart(
+        db: AsyncSession = Depends(get_async_db),
+        current_user: models_user.User = Depends(get_current_user),
+):
+    """The user's cart with products, line totals and subtotal, read in one query."""
+    cart = await crud_cart.get_cart_by_user_id_async(db, user_id=int(current_user.id))
     if not cart:
         # Create a cart if it doesn't exist for the user
-        cart = crud_cart.create_cart(db, CartCreate(user_id=int(current_user.id)))
+        cart = await crud_cart.create_cart_async(db, CartCreate(user_id=int(current_user.id)))
     return cart
 
 
-@router.post("/items", response_model=CartItem, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/items",
+    response_model=CartItem,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_200_OK: {"model": CartItem, "description": "Product was already in the cart"}},
+)
 def add_item_to_cart(
     item: CartItemCreate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models_user.User = Depends(get_current_user),
 ):
-    cart = crud_cart.get_cart_by_user_id(db, user_id=int(current_user.id))
-    if not cart:
-        cart = crud_cart.create_cart(db, CartCreate(user_id=int(current_user.id)))
-
-    # Check if product exists
-    product = crud_product.get_product(db, item.product_id)
-    if not product:
+    """Add a product to the cart (201), or increase its quantity if it is already there (200)."""
+    cart_id = crud_cart.get_or_create_cart_id(db, user_id=int(current_user.id))
+    cart_item, created = crud_cart.add_cart_item(db, cart_id, item.product_id, item.quantity)
+    if not cart_item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-
-    # Check if item already in cart, then update quantity
-    for existing_item in cart.items:
-        if existing_item.product_id == item.product_id:
-            updated_quantity = existing_item.quantity + item.quantity
-            return crud_cart.update_cart_item(db, existing_item, CartItemUpdate(quantity=updated_quantity))
-
-    return crud_cart.create_cart_item(db, item, int(cart.id))
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return cart_item
 
 
 @router.put("/items/{item_id}", response_model=CartItem)
@@ -62,7 +65,10 @@ def update_cart_item_quantity(
         crud_cart.delete_cart_item(db, db_item)
         return {"message": "Item removed from cart"}
 
-    return crud_cart.update_cart_item(db, db_item, item_update)
+    try:
+        return crud_cart.update_cart_item(db, db_item, item_update)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
 
 
 @router.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
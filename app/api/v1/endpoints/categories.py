@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.crud import crud_category
@@ -20,9 +20,17 @@ def create_category(
     return crud_category.create_category(db, category)
 
 @router.get("/", response_model=list[Category])
-def read_categories(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    categories = crud_category.get_categories(db, skip=skip, limit=limit)
-    return categories
+def read_categories(
+        response: Response,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        db: Session = Depends(get_db),
+):
+    page = crud_category.get_categories(db, skip=skip, limit=limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 @router.get("/{category_id}", response_model=Category)
 def read_category(category_id: int, db: Session = Depends(get_db)):
@@ -2,10 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.models.menu import Menu
-from app.models.menu_item import MenuItem
-from app.models.page import Page
-from app.models.site_setting import SiteSetting
+from app.crud import crud_cms
 from app.schemas import cms as schemas
 
 
@@ -15,34 +12,15 @@ router = APIRouter()
 @router.get("/menus/{location_slug}", response_model=schemas.Menu)
 def read_menu(location_slug: str, db: Session = Depends(get_db)):
     """Retrieve a menu by its location slug."""
-    menu = db.query(Menu).filter(Menu.location_slug == location_slug).first()
+    menu = crud_cms.get_menu_tree(db, location_slug)
     if not menu:
         raise HTTPException(status_code=404, detail="Menu not found")
-    items = (
-        db.query(MenuItem)
-        .filter(MenuItem.menu_id == menu.id)
-        .order_by(MenuItem.order)
-        .all()
-    )
+    return menu
 
-    def build_tree(parent: MenuItem) -> schemas.MenuItem:
-        children = (
-            db.query(MenuItem)
-            .filter(MenuItem.parent_id == parent.id)
-            .order_by(MenuItem.order)
-            .all()
-        )
-        return schemas.MenuItem(
-            title=str(parent.title),
-            url=str(parent.url),
-            children=[build_tree(child) for child in children],
-        )
-    return schemas.Menu(name=str(menu.name), items=[build_tree(i) for i in items])
-
-@router.get("/pages/{slug", response_model=schemas.Page)
+@router.get("/pages/{slug}", response_model=schemas.Page)
 def read_page(slug: str, db: Session = Depends(get_db)):
     """Retrieve a single page by slug."""
-    page = db.query(Page).filter(Page.slug == slug).first()
+    page = crud_cms.get_page(db, slug)
     if not page:
         raise HTTPException(status_code=404, detail="Page not found")
     return page
@@ -50,5 +28,4 @@ def read_page(slug: str, db: Session = Depends(get_db)):
 @router.get("/site-settings", response_model=dict)
 def read_site_settings(db: Session = Depends(get_db)):
     """Retrieve all site settings as key-value pairs."""
-    settings = db.query(SiteSetting).all()
-    return {s.key: s.value for s in settings}
\ No newline at end of file
+    return crud_cms.get_site_settings(db)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.crud import crud_payment
@@ -19,13 +19,17 @@ def create_payment(
 @router.get("/invoice/{invoice_id}", response_model=list[Payment])
 def read_payments_for_invoice(
         invoice_id : int,
+        response: Response,
         skip: int =0,
         limit: int = 100,
-        db: Depends = Depends(get_db),
+        cursor: str | None = None,
+        db: Session = Depends(get_db),
         current_user: models_user.User = Depends(get_current_user)
 ):
-    payments = crud_payment.get_payments_by_invoice(db, invoice_id, skip=skip, limit=limit)
-    return payments
+    page = crud_payment.get_payments_by_invoice(db, invoice_id, skip=skip, limit=limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 @router.get("/{payment_id}", response_model=Payment)
 def read_payment(
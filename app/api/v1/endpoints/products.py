@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.conditional import Validators
+from app.core.database import get_async_db, get_db
 from app.crud import crud_product as crud
 from app.dependencies import get_current_active_superuser
 from  app.schemas import product as schemas
@@ -10,16 +12,69 @@ router = APIRouter()
 
 
 @router.get("/", response_model=list[schemas.Product])
-def list_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Retrieve a list of products."""
-    return crud.get_products(db, skip=skip, limit=limit)
+async def list_products(
+        response: Response,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        db: AsyncSession = Depends(get_async_db),
+):
+    """Retrieve a list of products.
+
+    Pass the ``X-Next-Cursor`` header of a page back as ``cursor`` to fetch the next one.
+    """
+    page = await crud.get_products_async(db, skip=skip, limit=limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+@router.get("/search", response_model=schemas.ProductSearchResult)
+async def search_products(
+        response: Response,
+        min_price: float | None = Query(None, ge=0),
+        max_price: float | None = Query(None, ge=0),
+        language: str | None = None,
+        format: str | None = None,
+        status: str | None = None,
+        is_featured: bool | None = None,
+        category: str | None = Query(None, description="Category slug; includes its subcategories"),
+        tag: str | None = Query(None, description="Tag slug"),
+        skip: int = 0,
+        limit: int = Query(20, ge=1, le=100),
+        cursor: str | None = None,
+        db: AsyncSession = Depends(get_async_db),
+):
+    """Search the catalog with filters, returning a page of products and facet counts.
+
+    Each facet counts products matching every filter except its own, so the values of a selected
+    dimension keep showing how many products choosing them instead would return.
+    """
+    filters = schemas.ProductSearchFilters(
+        min_price=min_price, max_price=max_price, language=language, format=format, status=status,
+        is_featured=is_featured, category=category, tag=tag,
+    )
+    result = await crud.search_products_async(db, filters, skip=skip, limit=limit, cursor=cursor)
+    if result.page.next_cursor:
+        response.headers["X-Next-Cursor"] = result.page.next_cursor
+    return {"items": result.page.items, "total": result.total, "facets": result.facets}
 
 @router.get("/{slug}", response_model=schemas.Product)
-def get_product(slug: str, db: Session = Depends(get_db)):
-    """Retrieve a single product by slug."""
-    product = crud.get_product(db, slug=slug)
+async def get_product(slug: str, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """Retrieve a single product by slug.
+
+    Supports If-None-Match / If-Modified-Since: a 304 costs one narrow query.
+    """
+    version = await crud.get_product_version_async(db, slug)
+    if not version:
+        raise HTTPException(status_code=404, detail="Product not found")
+    validators = Validators.from_versions([version])
+    if validators.is_fresh(request):
+        return validators.not_modified()
+
+    product = await crud.get_product_async(db, slug=slug)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
+    validators.apply(response)
     return product
 
 @router.post("/", response_model=schemas.Product, status_code=status.HTTP_201_CREATED)
@@ -29,5 +84,8 @@ def create_product(
         current_user= Depends(get_current_active_superuser)
 ):
     """Create a new product. Requires superuser."""
-    return crud.create_product(db, product_in)
+    try:
+        return crud.create_product(db, product_in)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
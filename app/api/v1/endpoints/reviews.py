@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.crud import crud_product, crud_review
@@ -30,14 +30,23 @@ def create_review(
 
 
 @router.get("/product/{product_id}", response_model=list[Review])
-def read_reviews_for_product(product_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    reviews = crud_review.get_reviews_by_product(db, product_id, skip=skip, limit=limit)
-    return reviews
+def read_reviews_for_product(
+        product_id: int,
+        response: Response,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        db: Session = Depends(get_db),
+):
+    page = crud_review.get_reviews_by_product(db, product_id, skip=skip, limit=limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
 @router.get("/{review_id}", response_model=Review)
 def read_review(review_id: int, db: Session = Depends(get_db)):
-    review = crud_review.get_reviews(db, review_id)
+    review = crud_review.get_review(db, review_id)
     if not review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
     return review
@@ -59,7 +68,10 @@ def update_review(
             detail="Not authorized to update this review",
         )
 
-    return crud_review.update_review(db, db_review, review_update)
+    review = crud_review.update_review(db, db_review, review_update)
+    if not review:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+    return review
 
 
 @router.delete("/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -68,7 +80,7 @@ def delete_review(
     db: Session = Depends(get_db),
     current_user: models_user.User = Depends(get_current_user),
 ):
-    db_review = crud_review.get_reviews(db, review_id)
+    db_review = crud_review.get_review(db, review_id)
     if not db_review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
 
@@ -78,7 +90,8 @@ def delete_review(
             detail="Not authorized to delete this review",
         )
 
-    crud_review.delete_review(db, db_review)
+    if not crud_review.delete_review(db, db_review):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
     return
 
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.crud import crud_tag
@@ -18,9 +18,17 @@ def create_tag(tag: TagCreate,
     return crud_tag.create_tag(db, tag)
 
 @router.get("/", response_model=list[Tag])
-def read_tags(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    tags = crud_tag.get_tags(db, skip=skip, limit=limit)
-    return tags
+def read_tags(
+        response: Response,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        db: Session = Depends(get_db),
+):
+    page = crud_tag.get_tags(db, skip=skip, limit=limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 @router.get("/{tag_id}", response_model=Tag)
 def read_tag(tag_id: int, db: Session = Depends(get_db)):
@@ -1,8 +1,9 @@
 from email.policy import default
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
+from app.core.conditional import Validators
 from app.crud import crud_tool
 from app.dependencies import get_current_superuser, get_db
 from app.schemas.tool import Tool, ToolCreate, ToolUpdate
@@ -21,9 +22,17 @@ def create_tool(
     return crud_tool.create_tool(db, tool)
 
 @router.get("/", response_model=list[Tool])
-def read_tools(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    tools = crud_tool.get_tools(db, skip=skip, limit=limit)
-    return tools
+def read_tools(
+        response: Response,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        db: Session = Depends(get_db),
+):
+    page = crud_tool.get_tools(db, skip=skip, limit=limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 @router.get("/{tool_id}", response_model=Tool)
 def read_tool(tool_id: int, db: Session = Depends(get_db)):
@@ -33,10 +42,18 @@ def read_tool(tool_id: int, db: Session = Depends(get_db)):
     return tool
 
 @router.get("/slug/{slug}", response_model=Tool)
-def read_tool_by_slug(slug: str, db: Session = Depends(get_db)):
+def read_tool_by_slug(slug: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    version = crud_tool.get_tool_version(db, slug)
+    if not version:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tool not found")
+    validators = Validators.from_versions([version])
+    if validators.is_fresh(request):
+        return validators.not_modified()
+
     tool = crud_tool.get_tool_by_slug(db, slug=slug)
     if not tool:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tool not found")
+    validators.apply(response)
     return tool
 
 @router.put("/{tool_id}", response_model= Tool)
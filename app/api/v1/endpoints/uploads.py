@@ -1,10 +1,11 @@
-import uuid
-from pathlib import Path
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, status
-
-from app.core.config import settings
-from app.schemas.file import UploadResponse
+from app.core.database import get_async_db
+from app.core.image_pipeline import image_pipeline
+from app.core.storage import save_upload
+from app.crud import crud_image_derivative
+from app.schemas.file import ImageDerivative, UploadResponse
 
 router = APIRouter()
 
@@ -12,21 +13,22 @@ router = APIRouter()
 async def upload_file(file: UploadFile = File(...)) -> UploadResponse:
     """Save an uploaded file and return its accessible URL.
 
-    The upload directory is created with ``755`` permissions to ensure other
-    processes can read files while preventing unauthorized writes.
+    The file is streamed to storage in chunks on a worker thread, so memory use does not grow with
+    its size; uploads over ``MAX_UPLOAD_SIZE`` are rejected with 413. Files are keyed by content
+    hash, so re-uploading identical content returns the same, immutable URL. Images are queued
+    for resizing; follow their progress at ``/uploads/derivatives``.
     """
     if not file.filename:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No filename provided")
 
-    upload_dir = Path(settings.UPLOAD_DIR)
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    upload_dir.chmod(0o755)
-
-    extension = Path(file.filename).suffix
-    unique_name = f"{uuid.uuid4().hex}{extension}"
-    file_path = upload_dir / unique_name
-
-    with file_path.open("wb") as buffer:
-        buffer.write(await file.read())
-
-    return UploadResponse(url=f"/uploads/{unique_name}")
\ No newline at end of file
+    stored = await save_upload(file)
+    image_status = await image_pipeline.submit(stored) if image_pipeline.accepts(stored) else None
+    return UploadResponse(url=stored.url, size=stored.size, sha256=stored.sha256, image_status=image_status)
+
+@router.get("/derivatives", response_model=ImageDerivative)
+async def read_image_derivative(url: str, db: AsyncSession = Depends(get_async_db)):
+    """Status and variant URLs of an uploaded image, by the URL returned from the upload."""
+    derivative = await crud_image_derivative.get_image_derivative_async(db, url)
+    if not derivative:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No derivatives recorded for this image")
+    return derivative
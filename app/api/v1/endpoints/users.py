@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -11,16 +11,20 @@ router = APIRouter(dependencies=[Depends(verify_admin_ip)])
 
 @router.get("/", response_model=list[schemas_user.User])
 def read_users(
+        response: Response,
         skip: int = 0,
         limit: int = 100,
+        cursor: str | None = None,
         db: Session = Depends(get_db),
         current_user: schemas_user.User = Depends(get_current_active_superuser),
 ):
     """
     Retrieve a list of users. Requires superuser privileges.
     """
-    users = crud.get_users(db, skip=skip, limit=limit)
-    return users
+    page = crud.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 @router.post("/", response_model=schemas_user.User)
 def create_user(
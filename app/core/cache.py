@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+from app.core.metrics import CACHE_EVICTIONS, CACHE_LOOKUPS
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for a cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after a time-to-live."""
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 300.0):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._hit_counter = CACHE_LOOKUPS.labels(name, "hit")
+        self._miss_counter = CACHE_LOOKUPS.labels(name, "miss")
+        self._eviction_counter = CACHE_EVICTIONS.labels(name)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry (marking it recently used) or ``default``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                self._miss_counter.inc()
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                self._miss_counter.inc()
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            self._hit_counter.inc()
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+                self._eviction_counter.inc()
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Drop every string key starting with ``prefix``."""
+        with self._lock:
+            for key in [k for k in self._entries if isinstance(k, str) and k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._expirations, len(self._entries))
+
+
+# Site settings, menus and pages: read on every page render, changed a few times a day.
+# Writes invalidate only the writing process's copy; other workers may serve stale entries
+# for up to CMS_CACHE_TTL seconds.
+cms_cache = TTLCache("cms", maxsize=settings.CMS_CACHE_MAXSIZE, ttl=settings.CMS_CACHE_TTL)
+
+# Catalog facet counts: full aggregates over the product table, far costlier than the page they describe
+catalog_cache = TTLCache("catalog", maxsize=settings.CATALOG_CACHE_MAXSIZE, ttl=settings.CATALOG_CACHE_TTL)
@@ -0,0 +1,74 @@
+import hashlib
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; the app stores UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class Validators:
+    """Weak ETag (and optionally Last-Modified) for a representation, computed from row versions.
+
+    A version is ``(id, updated_at, ...)`` for each row the response is built from, so the
+    validators are known after one narrow query, before relationships are loaded or anything
+    is serialized.
+    """
+
+    etag: str
+    last_modified: datetime | None = None
+
+    @classmethod
+    def from_versions(cls, versions: Iterable[Sequence], last_modified: bool = True) -> "Validators":
+        """Build validators from row versions.
+
+        Pass ``last_modified=False`` for collections: removing a row changes the ETag but not the
+        newest timestamp, so If-Modified-Since alone cannot detect it.
+        """
+        digest = hashlib.blake2b(digest_size=12)
+        newest = None
+        for version in versions:
+            digest.update(repr(tuple(version)).encode())
+            for value in version:
+                if isinstance(value, datetime):
+                    value = _as_utc(value)
+                    newest = value if newest is None or value > newest else newest
+        return cls(etag=f'W/"{digest.hexdigest()}"', last_modified=newest if last_modified else None)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def is_fresh(self, request: Request) -> bool:
+        """Whether the client's cached copy is current (If-None-Match wins over If-Modified-Since)."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            # Weak comparison, as RFC 9110 requires for If-None-Match
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return self.etag.removeprefix("W/") in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified.replace(microsecond=0) <= _as_utc(since)
+        return False
+
+    def not_modified(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+    def apply(self, response: Response) -> None:
+        response.headers.update(self.headers)
@@ -6,7 +6,13 @@ class Settings(BaseSettings):
 
     #Database settings
     DATABASE_URL: str = "sqlite:///./sql_app.db"
+    # Optional override; derived from DATABASE_URL (aiosqlite / asyncpg) when unset
+    ASYNC_DATABASE_URL: str | None = None
     SQL_DEBUG: bool = False
+    # Adds X-DB-Query-Count / X-DB-Query-Time to every response
+    DEBUG: bool = False
+    # Warn when one normalized statement runs more than this many times in a request
+    N_PLUS_ONE_THRESHOLD: int = 10
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
@@ -14,6 +20,11 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change-me"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Seconds an authenticated user's identity/flags are reused before re-reading the DB
+    PRINCIPAL_CACHE_TTL: int = 60
+    # bcrypt runs on this many threads; at most PASSWORD_HASH_QUEUE more calls may wait
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE: int = 32
     API_V1_STR: str = "/api/v1"
     # Add other settings here, e.g., for email server
     SMTP_TLS: bool = True
@@ -28,10 +39,41 @@ class Settings(BaseSettings):
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://frontend:3000,http://example.com"
     ALLOWED_HOSTS: str = "localhost,127.0.0.1,testserver,backend,frontend"
     ADMIN_ALLOWED_IPS_STR: str = ""
+    ADMIN_DENIED_IPS_STR: str = ""
+    # Optional file of extra admin IP rules ("!" prefix denies), re-read when it changes
+    ADMIN_IPS_FILE: str | None = None
+    # Proxies whose X-Forwarded-For header is trusted to carry the real client IP
+    TRUSTED_PROXIES_STR: str = ""
 
     # File upload settings
     UPLOAD_DIR: str = "uploads"
+    # Where uploads are kept: "local" stores them under UPLOAD_DIR, keyed by content hash
+    STORAGE_BACKEND: str = "local"
+    # When set (e.g. "/protected-uploads"), /uploads responses carry X-Accel-Redirect to this
+    # internal location and the fronting proxy sends the file body
+    UPLOAD_ACCEL_REDIRECT_PREFIX: str | None = None
+    # Bytes; larger uploads get 413, checked while the request body is still arriving
+    MAX_UPLOAD_SIZE: int = 500 * 1024 * 1024
+    # Uploaded images get thumbnail/WebP variants on this many processes; at most
+    # IMAGE_QUEUE more images wait before new ones are marked failed
+    IMAGE_WORKERS: int = 2
+    IMAGE_QUEUE: int = 64
+
+    # Fraction of successful requests logged by RequestContextMiddleware (errors are always logged)
+    REQUEST_LOG_SAMPLE_RATE: float = 1.0
+
+    # In-process cache for CMS reads (menus, pages, site settings); also the longest time other
+    # workers can serve a menu or page after it is changed
+    CMS_CACHE_TTL: int = 300
+    CMS_CACHE_MAXSIZE: int = 1024
+    # Catalog facet counts per filter combination; products are invalidated on write, categories
+    # and tags only by expiry
+    CATALOG_CACHE_TTL: int = 60
+    CATALOG_CACHE_MAXSIZE: int = 4096
     REDIS_URL: str = "redis://localhost:6379/0"
+    # Shared key-value state: "memory" (single process, tests) or "redis" (uses REDIS_URL)
+    KV_BACKEND: str = "memory"
+    KV_NAMESPACE: str = "app"
     TESTING: bool = False
 
     @property
@@ -46,6 +88,14 @@ class Settings(BaseSettings):
     def ADMIN_ALLOWED_IPS(self) -> list[str]:  # noqa: N802
         return [item.strip() for item in self.ADMIN_ALLOWED_IPS_STR.split(",") if item.strip()]
 
+    @property
+    def ADMIN_DENIED_IPS(self) -> list[str]:  # noqa: N802
+        return [item.strip() for item in self.ADMIN_DENIED_IPS_STR.split(",") if item.strip()]
+
+    @property
+    def TRUSTED_PROXIES(self) -> list[str]:  # noqa: N802
+        return [item.strip() for item in self.TRUSTED_PROXIES_STR.split(",") if item.strip()]
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 settings = Settings()
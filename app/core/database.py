@@ -1,20 +1,46 @@
 import logging
 import time
 
+from collections.abc import AsyncIterator
+
 from sqlalchemy import create_engine, event
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from .config import settings
+from .metrics import DB_POOL_CHECKOUT_WAIT, DB_QUERY_DURATION, sql_operation
+from .query_stats import record_statement
 
 #configure logging
 logger = logging.getLogger(__name__)
 
+class _CheckoutTimingMixin:
+    """Records how long each pool checkout blocks, including time spent opening a connection."""
+
+    engine_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.engine_label).observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_CheckoutTimingMixin, QueuePool):
+    engine_label = "sync"
+
+
+class TimedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
 #configure database engine with settings
 engine = create_engine(
     settings.DATABASE_URL,
-    poolclass=QueuePool,
+    poolclass=TimedQueuePool,
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_timeout=settings.DB_POOL_TIMEOUT,
@@ -24,6 +50,36 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers used when DATABASE_URL names a sync one
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Return the async-driver equivalent of a database URL."""
+    db_url = make_url(url)
+    backend = db_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    return db_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+#configure async database engine with the same pool settings
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL),
+    poolclass=TimedAsyncQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    echo=settings.SQL_DEBUG,
+)
+
+# expire_on_commit is off so committed objects can still be serialized without lazy IO
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 def get_db():
     """dependency that provides a database session."""
@@ -33,14 +89,21 @@ def get_db():
     finally:
         db.close()
 
-# Add query timing for monitoring slow queries
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """dependency that provides an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Add query timing for monitoring slow queries and the db_query_duration_seconds histogram
 @event.listens_for(Engine, "before_cursor_execute")
 def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    conn.info.setdefault("query_start_time", []).append(time.time())
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
 
 
 @event.listens_for(Engine, "after_cursor_execute")
 def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    total = time.time() - conn.info["query_start_time"].pop(-1)
+    total = time.perf_counter() - conn.info["query_start_time"].pop(-1)
+    DB_QUERY_DURATION.labels(sql_operation(statement)).observe(total)
+    record_statement(statement, total)
     if total > 0.2:  # Log slow queries (>200ms)
         logger.warning(f"Slow query detected: {statement} - Execution time: {total:.2f}s")
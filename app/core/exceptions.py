@@ -21,3 +21,22 @@ class PermissionDeniedError(Exception):
 
     def __init__(self, detail: str = "Permission denied"):
         self.detail = detail
+
+class InvalidCursorError(Exception):
+    """Exception raised when a pagination cursor is malformed or belongs to another listing."""
+
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        self.detail = detail
+
+
+class PasswordHasherBusyError(Exception):
+    """Exception raised when the password hashing pool and its queue are full."""
+
+    def __init__(self, detail: str = "Server is busy, please retry shortly"):
+        self.detail = detail
+
+class UploadTooLargeError(Exception):
+    """Exception raised when an uploaded file exceeds MAX_UPLOAD_SIZE."""
+
+    def __init__(self, detail: str = "File exceeds the maximum upload size"):
+        self.detail = detail
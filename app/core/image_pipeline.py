@@ -0,0 +1,126 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import PurePosixPath
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.images import render_variants
+from app.core.metrics import IMAGE_DERIVATIVES, IMAGE_PIPELINE_PENDING
+from app.core.storage import StorageBackend, StoredFile, storage
+from app.crud import crud_image_derivative
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".webp", ".gif"})
+
+
+class ImagePipeline:
+    """Generates resized WebP variants of uploaded images on a process pool.
+
+    Decoding and resizing are CPU-bound, so they run in worker processes; the event loop only
+    schedules work and records results. At most ``max_workers + max_queue`` images are in
+    flight per process; beyond that new images are recorded as failed straight away, so bursts
+    cost uploads nothing. Re-uploading the same image retries it.
+    """
+
+    def __init__(self, max_workers: int = settings.IMAGE_WORKERS, max_queue: int = settings.IMAGE_QUEUE,
+                 store: StorageBackend = storage):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.storage = store
+        self._executor: ProcessPoolExecutor | None = None
+        # None marks a slot reserved by a submit that has not started its task yet
+        self._in_flight: dict[str, asyncio.Task | None] = {}
+
+    @staticmethod
+    def accepts(stored: StoredFile) -> bool:
+        return PurePosixPath(stored.key).suffix in IMAGE_EXTENSIONS
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and DB pools is not safe
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def submit(self, stored: StoredFile) -> str:
+        """Schedule variants for a stored image and return the derivative's status."""
+        if stored.url in self._in_flight:
+            return "pending"
+        # Reserve the slot before the first await, so concurrent uploads of one image schedule it once
+        self._in_flight[stored.url] = None
+        try:
+            status = await self._record_submission(stored)
+        except BaseException:
+            del self._in_flight[stored.url]
+            raise
+        if status != "pending":
+            del self._in_flight[stored.url]
+            return status
+
+        task = asyncio.create_task(self._process(stored))
+        self._in_flight[stored.url] = task
+        IMAGE_PIPELINE_PENDING.inc()
+        task.add_done_callback(lambda _: self._done(stored.url))
+        return "pending"
+
+    async def _record_submission(self, stored: StoredFile) -> str:
+        """Record a reserved image as pending, or return why it should not be processed."""
+        async with AsyncSessionLocal() as db:
+            existing = await crud_image_derivative.get_image_derivative_async(db, stored.url)
+            if existing is not None and existing.status == "ready":
+                return existing.status
+            # The count includes this image's own reservation
+            if len(self._in_flight) > self.max_workers + self.max_queue:
+                IMAGE_DERIVATIVES.labels("rejected").inc()
+                await crud_image_derivative.save_image_derivative_async(
+                    db, stored.url, "failed", error="Image pipeline is busy; upload the image again to retry")
+                return "failed"
+            await crud_image_derivative.save_image_derivative_async(db, stored.url, "pending")
+        return "pending"
+
+    def _done(self, url: str) -> None:
+        self._in_flight.pop(url, None)
+        IMAGE_PIPELINE_PENDING.dec()
+
+    def _read(self, key: str) -> bytes:
+        with self.storage.open(key) as source:
+            return source.read()
+
+    async def _process(self, stored: StoredFile) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            data = await run_in_threadpool(self._read, stored.key)
+            rendered = await loop.run_in_executor(self._get_executor(), render_variants, data)
+            variants = {}
+            for name, content in rendered.items():
+                variant = await run_in_threadpool(self.storage.save, io.BytesIO(content), ".webp")
+                variants[name] = variant.url
+        except Exception as exc:
+            logger.exception("Image derivatives failed for %s", stored.url)
+            status, variants, error = "failed", {}, f"{exc.__class__.__name__}: {exc}"
+        else:
+            status, error = "ready", None
+        IMAGE_DERIVATIVES.labels(status).inc()
+        try:
+            async with AsyncSessionLocal() as db:
+                await crud_image_derivative.save_image_derivative_async(db, stored.url, status, variants, error)
+        except Exception:
+            logger.exception("Could not record image derivatives for %s", stored.url)
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Give in-flight images ``timeout`` seconds to finish, then stop the worker processes."""
+        tasks = [task for task in self._in_flight.values() if task is not None]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+image_pipeline = ImagePipeline()
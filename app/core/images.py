@@ -0,0 +1,31 @@
+"""Image resizing run inside the image pipeline's worker processes.
+
+Kept free of application imports so spawned workers start quickly.
+"""
+import io
+
+from PIL import Image, ImageOps
+
+# Variant name -> longest edge in pixels
+VARIANT_SIZES = {"thumb": 320, "medium": 960}
+WEBP_QUALITY = 80
+
+
+def render_variants(data: bytes, sizes: dict[str, int] = VARIANT_SIZES) -> dict[str, bytes]:
+    """Decode an image once and return a WebP encoding of it for each size."""
+    with Image.open(io.BytesIO(data)) as image:
+        # JPEG can decode at a reduced scale directly, far cheaper than a full decode then resize
+        largest = max(sizes.values())
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+        rendered = {}
+        for name, size in sizes.items():
+            variant = image.copy()
+            variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            variant.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+            rendered[name] = buffer.getvalue()
+        return rendered
@@ -1,56 +1,187 @@
 import ipaddress
+import logging
+import threading
+import time
+from bisect import bisect_right
+from collections.abc import Iterable
+from pathlib import Path
 
 from fastapi import HTTPException, Request
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+IPAddress = ipaddress.IPv4Address | ipaddress.IPv6Address
+IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+def parse_network(entry: str) -> IPNetwork:
+    """Parse an IP or CIDR range; a bare address becomes a /32 or /128."""
+    try:
+        return ipaddress.ip_network(entry.strip(), strict=False)
+    except ValueError:
+        raise ValueError(f"Invalid IP address or CIDR range: {entry}")
+
+
+def parse_address(ip: str) -> IPAddress | None:
+    """Parse a client address, unwrapping IPv4-mapped IPv6 (::ffff:a.b.c.d); None if invalid."""
+    try:
+        address = ipaddress.ip_address(ip.strip())
+    except ValueError:
+        return None
+    if address.version == 6 and address.ipv4_mapped is not None:
+        return address.ipv4_mapped
+    return address
+
+
+class IPRangeSet:
+    """Networks compiled into sorted, merged integer ranges per address family.
+
+    Membership is a single bisect, so lookups stay O(log n) however many ranges are loaded.
+    Instances are immutable; build a new one to change the ranges.
+    """
+
+    def __init__(self, networks: Iterable[IPNetwork] = ()):
+        spans: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+        for network in networks:
+            spans[network.version].append((int(network.network_address), int(network.broadcast_address)))
+
+        self._starts: dict[int, list[int]] = {}
+        self._ends: dict[int, list[int]] = {}
+        for version, ranges in spans.items():
+            merged: list[list[int]] = []
+            for start, end in sorted(ranges):
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self._starts[version] = [start for start, _ in merged]
+            self._ends[version] = [end for _, end in merged]
+
+    def __contains__(self, address: IPAddress) -> bool:
+        value = int(address)
+        index = bisect_right(self._starts[address.version], value) - 1
+        return index >= 0 and value <= self._ends[address.version][index]
+
+    def __len__(self) -> int:
+        return len(self._starts[4]) + len(self._starts[6])
+
 
 class IPFilter:
-    def __init__(self, allowed_ips: list[str] | None = None):
-        self.allowed_ips: set[str] = set()
-        if allowed_ips:
-            for ip in allowed_ips:
-                self.add_ip(ip)
+    """Allow/deny lists for client IPs; a deny match always wins, an empty allowlist allows all.
+
+    With ``path`` set, entries from that file (one per line, ``!`` prefix to deny, ``#`` for
+    comments) are added to the configured ones, and ``reload_if_changed`` picks up edits without
+    a restart. Rules are swapped in one assignment, so concurrent lookups never see a mix.
+    """
+
+    RELOAD_INTERVAL = 5.0
+
+    def __init__(self, allowed_ips: list[str] | None = None, denied_ips: list[str] | None = None,
+                 path: str | Path | None = None):
+        self.allowed_ips: list[str] = []
+        self.denied_ips: list[str] = []
+        self.path = Path(path) if path else None
+        self._rules = (IPRangeSet(), IPRangeSet())
+        self._file_entries: tuple[list[str], list[str]] = ([], [])
+        self._file_mtime: int | None = None
+        self._checked_at = time.monotonic()
+        self._reload_lock = threading.Lock()
+
+        if self.path is not None and self.path.exists():
+            self._file_entries = self.read_file(self.path)
+            self._file_mtime = self.path.stat().st_mtime_ns
+        self.reload(allowed_ips or [], denied_ips or [])
 
     def add_ip(self, ip: str):
-        """Add an IP or CTDR range to the whitelist."""
-        try:
-            # Check if it's a CIDR range
-            if "/" in ip:
-                network = ipaddress.ip_network(ip, strict=False)
-                self.allowed_ips.add(str(network))
-            else:
-                # Single IP address
-                ipaddress.ip_address(ip)
-                self.allowed_ips.add(ip)
-        except ValueError:
-            raise ValueError(f"Invalid IP address or CIDR range: {ip}")
+        """Add an IP or CIDR range to the whitelist."""
+        self.reload([*self.allowed_ips, ip], self.denied_ips)
+
+    def reload(self, allowed_ips: list[str], denied_ips: list[str]) -> None:
+        """Replace the configured lists; raises ValueError and keeps the old rules on a bad entry."""
+        file_allowed, file_denied = self._file_entries
+        allowed = IPRangeSet(parse_network(ip) for ip in [*allowed_ips, *file_allowed])
+        denied = IPRangeSet(parse_network(ip) for ip in [*denied_ips, *file_denied])
+        self.allowed_ips, self.denied_ips = list(allowed_ips), list(denied_ips)
+        self._rules = (allowed, denied)
+
+    @staticmethod
+    def read_file(path: Path) -> tuple[list[str], list[str]]:
+        allowed: list[str] = []
+        denied: list[str] = []
+        for line in path.read_text().splitlines():
+            entry = line.split("#", 1)[0].strip()
+            if entry.startswith("!"):
+                denied.append(entry[1:].strip())
+            elif entry:
+                allowed.append(entry)
+        return allowed, denied
+
+    def reload_if_changed(self) -> None:
+        """Re-read ``path`` if it changed; checks at most once every ``RELOAD_INTERVAL`` seconds."""
+        if self.path is None or time.monotonic() - self._checked_at < self.RELOAD_INTERVAL:
+            return
+        with self._reload_lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = self.path.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime == self._file_mtime:
+                return
+            previous = self._file_entries
+            try:
+                self._file_entries = self.read_file(self.path) if mtime is not None else ([], [])
+                self.reload(self.allowed_ips, self.denied_ips)
+            except (OSError, ValueError):
+                self._file_entries = previous
+                logger.exception("Keeping previous IP rules; could not load %s", self.path)
+                return
+            self._file_mtime = mtime
+            logger.info("Reloaded IP rules from %s", self.path)
 
     def is_allowed(self, ip: str) -> bool:
         """Check if an IP is allowed."""
-        if not self.allowed_ips:
-            return True # Allow all if no restrictions set
-
-        try:
-            ip_addr = ipaddress.ip_address(ip)
-            # Check direct IP match
-            if str(ip_addr) in self.allowed_ips:
-                return True
-
-            # Check CIDR ranges
-            for allowed in self.allowed_ips:
-                if "/" in allowed:
-                    network = ipaddress.ip_network(allowed, strict=False)
-                    if ip_addr in network:
-                        return True
+        allowed, denied = self._rules
+        if not allowed and not denied:
+            return True  # Allow all if no restrictions set
+        address = parse_address(ip)
+        if address is None:
             return False
-        except ValueError:
+        if address in denied:
             return False
+        return not allowed or address in allowed
+
+
+trusted_proxies = IPRangeSet(parse_network(ip) for ip in settings.TRUSTED_PROXIES)
+
+
+def client_ip(request: Request) -> str:
+    """The client address, taken from X-Forwarded-For only when the peer is a trusted proxy.
+
+    Hops are read right to left, skipping trusted proxies, so a client cannot spoof its address by
+    sending its own X-Forwarded-For header.
+    """
+    peer = request.client.host if request.client else "unknown"
+    forwarded = request.headers.get("X-Forwarded-For")
+    if not forwarded or not trusted_proxies:
+        return peer
+    address = parse_address(peer)
+    if address is None or address not in trusted_proxies:
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        address = parse_address(hop)
+        if address is None or address not in trusted_proxies:
+            return hop
+    return hops[0] if hops else peer
+
 
-ip_filter = IPFilter(settings.ADMIN_ALLOWED_IPS)
+ip_filter = IPFilter(settings.ADMIN_ALLOWED_IPS, settings.ADMIN_DENIED_IPS, settings.ADMIN_IPS_FILE)
 
 
 async def verify_admin_ip(request: Request):
-    client_ip = request.client.host if request.client else "unknown"
-    if not ip_filter.is_allowed(client_ip):
-        raise HTTPException(status_code=403, detail="Access denied: Your IP is not whitelisted for admin access.")
\ No newline at end of file
+    ip_filter.reload_if_changed()
+    if not ip_filter.is_allowed(client_ip(request)):
+        raise HTTPException(status_code=403, detail="Access denied: Your IP is not whitelisted for admin access.")
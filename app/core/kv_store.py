@@ -0,0 +1,211 @@
+import copy
+import heapq
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from app.core.config import settings
+
+
+class KeyValueStore(ABC):
+    """Key-value storage for state shared between workers (rate limits, revoked tokens, caches).
+
+    Values are strings; ``ttl`` is in seconds. Every key is prefixed with the store's namespace,
+    and ``namespaced`` returns a view that shares the same backend under a longer prefix.
+    """
+
+    def __init__(self, namespace: str = ""):
+        self.namespace = namespace
+
+    def namespaced(self, namespace: str) -> "KeyValueStore":
+        view = copy.copy(self)
+        view.namespace = f"{self.namespace}:{namespace}" if self.namespace else namespace
+        return view
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}" if self.namespace else key
+
+    @abstractmethod
+    def get(self, key: str) -> str | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: float | None = None) -> None: ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None: ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """Return the values of the keys that exist, in one round trip."""
+
+    @abstractmethod
+    def set_many(self, mapping: Mapping[str, str], ttl: float | None = None) -> None:
+        """Store several values in one round trip."""
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        """Atomically add to a counter; ``ttl`` is applied only when the counter is created."""
+
+    def get_json(self, key: str) -> Any:
+        value = self.get(key)
+        return None if value is None else json.loads(value)
+
+    def set_json(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.set(key, json.dumps(value, separators=(",", ":")), ttl)
+
+
+class MemoryStore(KeyValueStore):
+    """Process-local store; expired keys are purged from a heap of expiry times on every write."""
+
+    def __init__(self, namespace: str = ""):
+        super().__init__(namespace)
+        self._data: dict[str, tuple[str, float | None]] = {}
+        self._expiries: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def _live(self, key: str, now: float) -> tuple[str, float | None] | None:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= now:
+            del self._data[key]
+            return None
+        return entry
+
+    def _purge(self, now: float) -> None:
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiries)
+            entry = self._data.get(key)
+            # Skip heap records left behind by an overwrite with a different expiry
+            if entry is not None and entry[1] == expires_at:
+                del self._data[key]
+
+    def _store(self, key: str, value: str, ttl: float | None, now: float) -> None:
+        expires_at = now + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        if expires_at is not None:
+            heapq.heappush(self._expiries, (expires_at, key))
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._live(self._key(key), time.monotonic())
+            return entry[0] if entry else None
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._purge(now)
+            self._store(self._key(key), value, ttl, now)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(self._key(key), None)
+
+    def exists(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        with self._lock:
+            now = time.monotonic()
+            found = {key: self._live(self._key(key), now) for key in keys}
+            return {key: entry[0] for key, entry in found.items() if entry}
+
+    def set_many(self, mapping: Mapping[str, str], ttl: float | None = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._purge(now)
+            for key, value in mapping.items():
+                self._store(self._key(key), value, ttl, now)
+
+    def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        with self._lock:
+            now = time.monotonic()
+            self._purge(now)
+            full_key = self._key(key)
+            entry = self._live(full_key, now)
+            if entry is None:
+                value = amount
+                self._store(full_key, str(value), ttl, now)
+            else:
+                value = int(entry[0]) + amount
+                self._data[full_key] = (str(value), entry[1])
+            return value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisStore(KeyValueStore):
+    """Redis-backed store shared by every worker and node pointing at the same server.
+
+    Any client with the redis-py interface works, so tests can pass a local stand-in
+    such as ``fakeredis.FakeRedis(decode_responses=True)``.
+    """
+
+    def __init__(self, namespace: str = "", url: str | None = None, client=None):
+        super().__init__(namespace)
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url or settings.REDIS_URL, decode_responses=True)
+        self.client = client
+
+    @staticmethod
+    def _ttl_ms(ttl: float | None) -> int | None:
+        return max(1, int(ttl * 1000)) if ttl is not None else None
+
+    def get(self, key: str) -> str | None:
+        return self.client.get(self._key(key))
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        self.client.set(self._key(key), value, px=self._ttl_ms(ttl))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self._key(key) for key in keys))
+
+    def exists(self, key: str) -> bool:
+        return bool(self.client.exists(self._key(key)))
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.client.mget([self._key(key) for key in keys])
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, mapping: Mapping[str, str], ttl: float | None = None) -> None:
+        if not mapping:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(self._key(key), value, px=self._ttl_ms(ttl))
+        pipe.execute()
+
+    def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        full_key = self._key(key)
+        pipe = self.client.pipeline(transaction=True)
+        if ttl is not None:
+            # Creates the counter with its expiry only if it is missing; INCRBY keeps the TTL
+            pipe.set(full_key, 0, px=self._ttl_ms(ttl), nx=True)
+        pipe.incrby(full_key, amount)
+        return int(pipe.execute()[-1])
+
+
+def create_store(backend: str | None = None, namespace: str | None = None) -> KeyValueStore:
+    """Build the store selected by ``settings.KV_BACKEND`` ("memory" or "redis")."""
+    backend = backend or settings.KV_BACKEND
+    namespace = settings.KV_NAMESPACE if namespace is None else namespace
+    if backend == "memory":
+        return MemoryStore(namespace)
+    if backend == "redis":
+        return RedisStore(namespace)
+    raise ValueError(f"Unknown key-value backend: {backend}")
+
+
+kv_store = create_store()
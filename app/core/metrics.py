@@ -0,0 +1,103 @@
+"""Prometheus metrics shared by the middleware, database engines and caches.
+
+Under gunicorn, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty, writable directory before the
+workers start (see ``gunicorn.conf.py``). prometheus_client then writes samples to per-process
+files there, and ``/metrics`` aggregates them so any worker can serve the scrape.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Default buckets top out at 10s; SQL statements and pool waits need finer low-end resolution
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time by statement type.",
+    ["operation"],
+    buckets=DB_BUCKETS,
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, including opening a new one.",
+    ["engine"],
+    buckets=DB_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by cache name and result (hit or miss).",
+    ["cache", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entries dropped from a cache to stay within its size limit.",
+    ["cache"],
+)
+IMAGE_DERIVATIVES = Counter(
+    "image_derivatives_total",
+    "Images processed by the derivative pipeline, by outcome (ready, failed or rejected).",
+    ["status"],
+)
+IMAGE_PIPELINE_PENDING = Gauge(
+    "image_pipeline_pending",
+    "Images queued or being resized by the derivative pipeline.",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASHES_IN_FLIGHT = Gauge(
+    "password_hashes_in_flight",
+    "bcrypt hash/verify calls in the password pool, by state (running or queued).",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time a bcrypt hash/verify call spends running on the password pool.",
+)
+PASSWORD_HASH_WAIT = Histogram(
+    "password_hash_wait_seconds",
+    "Time a bcrypt hash/verify call waits in the password pool's queue before running.",
+    buckets=DB_BUCKETS,
+)
+PASSWORD_HASHES_REJECTED = Counter(
+    "password_hashes_rejected_total",
+    "bcrypt calls refused because the password pool and its queue were full (answered with 503).",
+)
+
+SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "ROLLBACK"})
+
+
+def sql_operation(statement: str) -> str:
+    """Bounded label for a statement: its leading keyword, or ``OTHER``."""
+    keyword = statement.lstrip()[:10].split(None, 1)
+    operation = keyword[0].upper() if keyword else ""
+    return operation if operation in SQL_OPERATIONS else "OTHER"
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the exposition payload and its content type, merging worker files in multiprocess mode."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
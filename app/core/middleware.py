@@ -1,55 +1,190 @@
 import logging
+import random
 import time
 import uuid
-from collections.abc import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.types import ASGIApp
+from fastapi import HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import REQUEST_LATENCY, REQUESTS_IN_PROGRESS
+from app.core.query_stats import end_request, start_request
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(meaasge)s")
 logger = logging.getLogger(__name__)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    def __init__(
-            self,
-            app: ASGIApp,
-    ) -> None:
-        super().__init__(app)
-
-    async def dispatch(
-            self,
-            request: Request,
-            call_next: Callable
-    ) -> Response:
-        request_id = str(uuid.uuid4())
-        start_time = time.time()
-
-        # Log request
-        client_host = request.client.host if request.client else "unknown"
-        logger.info(
-            f"Request started - ID: {request_id} - Method: {request.method} - "
-            f"Path: {request.url.path} - Client: {client_host}"
-        )
+REQUEST_ID_HEADER = "X-Request-ID"
+PROCESS_TIME_HEADER = "X-Process-Time"
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Query-Time"
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware that tags each request with an ID and its processing time.
+
+    Headers are added to the ``http.response.start`` message as it passes through, so response
+    bodies (including streaming ones) are never buffered or re-wrapped. A client-supplied
+    ``X-Request-ID`` is reused; otherwise one is generated and stored in ``request.state``.
+    Completed requests are logged for a ``sample_rate`` fraction of traffic; server errors
+    are always logged.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        incoming_id = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        request_id = incoming_id if incoming_id and len(incoming_id) <= 128 else uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        status_code = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(REQUEST_ID_HEADER, request_id)
+                headers.append(PROCESS_TIME_HEADER, f"{(time.perf_counter_ns() - start) / 1e9:.6f}")
+            await send(message)
 
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_headers)
+        except Exception:
+            logger.exception("Request failed - ID: %s - Method: %s - Path: %s",
+                             request_id, scope["method"], scope["path"])
+            raise
 
-            # Log response
-            process_time = time.time() - start_time
+        if status_code >= 500 or self.sample_rate >= 1.0 or random.random() < self.sample_rate:
+            client = scope.get("client")
             logger.info(
-                f"Request completed - ID: {request_id} - Status: {response.status_code} - "
-                f"Duration: {process_time:.3f}s"
+                "Request completed - ID: %s - Method: %s - Path: %s - Client: %s - Status: %s - Duration: %.3fms",
+                request_id, scope["method"], scope["path"], client[0] if client else "unknown",
+                status_code, (time.perf_counter_ns() - start) / 1e6,
             )
 
-            # Add custom headers
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = str(process_time)
 
-            return response
+class MetricsMiddleware:
+    """Pure ASGI middleware feeding the request latency histogram and in-flight gauge.
 
-        except Exception as e:
-            logger.error(f"Request failed - ID: {request_id} - Error: {str(e)}")
-            raise
+    Requests are labelled by route template (``/products/{slug}``) rather than raw path so label
+    cardinality stays bounded; paths that match no route are grouped under ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        root_path = scope.get("root_path", "")
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            REQUEST_LATENCY.labels(method, self.route_template(scope, root_path), str(status_code)).observe(
+                time.perf_counter() - start
+            )
+
+    @staticmethod
+    def route_template(scope: Scope, root_path: str) -> str:
+        # The router copies the matched route into the scope it was handed, which is this one
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        # Mounted apps (e.g. /uploads) only extend root_path
+        mount_path = scope.get("root_path", "")[len(root_path):]
+        if mount_path:
+            return f"{mount_path}/{{path:path}}"
+        return "unmatched"
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware that scopes SQL statement counting to each request.
+
+    Statements are counted through the engine listeners in ``app.core.database``; repeated
+    statements trigger the N+1 warning in ``app.core.query_stats``. With ``debug`` on, the count
+    and total DB time (ms) so far are added to the response headers.
+    """
+
+    def __init__(self, app: ASGIApp, debug: bool = False) -> None:
+        self.app = app
+        self.debug = debug
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_request()
+
+        async def send_with_headers(message: Message) -> None:
+            if self.debug and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(QUERY_COUNT_HEADER, str(stats.count))
+                headers.append(QUERY_TIME_HEADER, f"{stats.duration * 1000:.3f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            end_request(token)
+
+
+class BodySizeLimitMiddleware:
+    """Pure ASGI middleware rejecting request bodies over ``max_body_size`` bytes with 413.
+
+    A declared Content-Length over the limit is refused before any body is read; otherwise bytes
+    are counted as they arrive, so an oversized chunked upload is cut off without being spooled
+    in full. Only paths under ``path_prefix`` are checked.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int, path_prefix: str = "") -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_prefix = path_prefix
+        self.detail = f"Request body exceeds the maximum size of {max_body_size} bytes"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse({"detail": self.detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Raised while FastAPI parses the form, which passes HTTPExceptions through
+                    raise HTTPException(status_code=413, detail=self.detail)
+            return message
 
+        await self.app(scope, limited_receive, send)
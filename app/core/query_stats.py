@@ -0,0 +1,120 @@
+import logging
+import re
+import sys
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = str(Path(__file__).resolve().parents[1])
+PROJECT_DIR = str(Path(APP_DIR).parent)
+# Frames in these files are the instrumentation itself, never the call site worth reporting
+_SKIPPED_FILES = (str(Path(__file__).resolve()), str(Path(__file__).with_name("database.py").resolve()))
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanding IN lists render one placeholder per value; collapse them so batch sizes don't split keys
+_PLACEHOLDER_LIST = re.compile(r"\((?:\?|%s|%\(\w+\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+))*\)")
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace and IN-list placeholders so repeats of one query compare equal."""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+@dataclass
+class QueryStats:
+    """Statements executed within one request (or one ``assert_max_queries`` block)."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    warned: set[str] = field(default_factory=set)
+
+    def record(self, statement: str, duration: float) -> None:
+        normalized = normalize_statement(statement)
+        self.count += 1
+        self.duration += duration
+        self.statements[normalized] += 1
+        repeats = self.statements[normalized]
+        if repeats > settings.N_PLUS_ONE_THRESHOLD and normalized not in self.warned:
+            self.warned.add(normalized)
+            logger.warning("Possible N+1: statement ran %d times in one request at %s: %s",
+                           repeats, _call_site(), normalized)
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def start_request() -> tuple[QueryStats, Token]:
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def end_request(token: Token) -> None:
+    _current_stats.reset(token)
+
+
+def current_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+def record_statement(statement: str, duration: float) -> None:
+    """Called from the engine's after_cursor_execute listener; a no-op outside a request."""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+
+
+def _app_frame(frame) -> str | None:
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_DIR) and filename not in _SKIPPED_FILES:
+            return f"{filename[len(PROJECT_DIR) + 1:]}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _call_site() -> str:
+    """First frame in application code that led to the statement."""
+    site = _app_frame(sys._getframe(1))
+    if site is None:
+        # Async sessions run the ORM in a child greenlet; the awaiting caller is on its parent's stack
+        greenlet = sys.modules.get("greenlet")
+        parent = greenlet.getcurrent().parent if greenlet else None
+        if parent is not None:
+            site = _app_frame(parent.gr_frame)
+    return site or "unknown"
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail if more than ``limit`` statements run inside the block, listing what ran.
+
+    Counts on every engine and thread, so it covers requests made through ``TestClient``::
+
+        with assert_max_queries(3):
+            client.get("/api/v1/products/")
+    """
+    stats = QueryStats()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        stats.count += 1
+        stats.statements[normalize_statement(statement)] += 1
+
+    event.listen(Engine, "after_cursor_execute", count)
+    try:
+        yield stats
+    finally:
+        event.remove(Engine, "after_cursor_execute", count)
+    if stats.count > limit:
+        executed = "\n".join(f"  {n} x {statement}" for statement, n in stats.statements.most_common())
+        raise AssertionError(f"Expected at most {limit} queries, {stats.count} ran:\n{executed}")
@@ -0,0 +1,68 @@
+import math
+import time
+
+from fastapi import HTTPException, Request
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+
+from app.core.exceptions import InvalidCredentialsError, TokenExpiredError
+from app.core.ip_filter import client_ip
+from app.core.kv_store import KeyValueStore, kv_store
+from app.core.security import verify_token
+
+
+class RateLimiter:
+    """Approximate sliding-window rate limit, usable as a FastAPI dependency.
+
+    Each key keeps one counter per fixed window; the previous window's count is weighted by how
+    much of it still overlaps the sliding window. That is two O(1) store operations per request,
+    and counters expire after two windows so idle clients cost nothing. Limits are shared across
+    workers when the store is (see ``settings.KV_BACKEND``).
+
+    ``key_by`` is ``"ip"`` or ``"user"``; the latter keys on the bearer token's subject and falls
+    back to the client IP for anonymous requests.
+    """
+
+    def __init__(self, limit: int, window: int, scope: str, key_by: str = "ip",
+                 store: KeyValueStore | None = None):
+        if key_by not in ("ip", "user"):
+            raise ValueError(f"Unknown rate limit key: {key_by}")
+        self.limit = limit
+        self.window = window
+        self.scope = scope
+        self.key_by = key_by
+        self.store = (kv_store if store is None else store).namespaced("ratelimit")
+
+    def hit(self, identity: str, now: float | None = None) -> float:
+        """Record a request; return 0 if it is allowed, otherwise seconds until it would be."""
+        now = time.time() if now is None else now
+        window_index, elapsed = divmod(now, self.window)
+        current_key = f"{self.scope}:{identity}:{int(window_index)}"
+        previous_key = f"{self.scope}:{identity}:{int(window_index) - 1}"
+
+        current = self.store.incr(current_key, ttl=self.window * 2)
+        previous = int(self.store.get(previous_key) or 0)
+        estimated = previous * (1 - elapsed / self.window) + current
+        if estimated <= self.limit:
+            return 0.0
+        return self.window - elapsed
+
+    def identify(self, request: Request) -> str:
+        if self.key_by == "user":
+            scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    subject = verify_token(token).get("sub")
+                except (InvalidCredentialsError, TokenExpiredError):
+                    subject = None
+                if subject:
+                    return f"user:{subject}"
+        return f"ip:{client_ip(request)}"
+
+    def __call__(self, request: Request) -> None:
+        retry_after = self.hit(self.identify(request))
+        if retry_after:
+            raise HTTPException(
+                status_code=HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
@@ -1,13 +1,28 @@
+import asyncio
 import logging
 import re
 import secrets
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
-from app.core.exceptions import InvalidCredentialsError, TokenExpiredError
+from app.core.exceptions import InvalidCredentialsError, PasswordHasherBusyError, TokenExpiredError
+from app.core.kv_store import KeyValueStore, kv_store
+from app.core.metrics import (
+    CACHE_LOOKUPS,
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_WAIT,
+    PASSWORD_HASHES_IN_FLIGHT,
+    PASSWORD_HASHES_REJECTED,
+)
 
 #Configure logging
 logging.getLogger("passlib").setLevel(logging.ERROR)
@@ -17,13 +32,115 @@ pwd_context = CryptContext(
     schemes= ["bcrypt"], deprecated="auto", bcrypt__rounds=12  #Recommended number of rounds for security
 )
 
+@dataclass(frozen=True)
+class PasswordHasherStats:
+    """Point-in-time counters for the password hashing pool."""
+
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+    avg_hash_seconds: float
+    max_hash_seconds: float
+    avg_wait_seconds: float
+
+
+class PasswordHasher:
+    """Runs bcrypt hash/verify on a bounded thread pool, away from the event loop.
+
+    bcrypt releases the GIL, so the pool hashes in parallel. At most ``max_workers`` calls run and
+    ``max_queue`` more wait; anything beyond that raises ``PasswordHasherBusyError`` immediately
+    instead of piling up behind a login burst. Queue depth, wait and hash time are exported as
+    Prometheus metrics (``password_hash*``); ``stats()`` gives the same figures in-process.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._hash_seconds = 0.0
+        self._max_hash_seconds = 0.0
+        self._wait_seconds = 0.0
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            PASSWORD_HASHES_REJECTED.inc()
+            raise PasswordHasherBusyError()
+        with self._lock:
+            self._in_flight += 1
+        PASSWORD_HASHES_IN_FLIGHT.labels("queued").inc()
+        submitted = time.perf_counter()
+
+        def run() -> Any:
+            started = time.perf_counter()
+            PASSWORD_HASHES_IN_FLIGHT.labels("queued").dec()
+            PASSWORD_HASHES_IN_FLIGHT.labels("running").inc()
+            PASSWORD_HASH_WAIT.observe(started - submitted)
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                PASSWORD_HASHES_IN_FLIGHT.labels("running").dec()
+                PASSWORD_HASH_DURATION.observe(finished - started)
+                with self._lock:
+                    self._in_flight -= 1
+                    self._completed += 1
+                    self._wait_seconds += started - submitted
+                    self._hash_seconds += finished - started
+                    self._max_hash_seconds = max(self._max_hash_seconds, finished - started)
+                self._slots.release()
+
+        return self._executor.submit(run)
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(pwd_context.hash, password))
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(pwd_context.verify, plain_password, hashed_password))
+
+    def hash_sync(self, password: str) -> str:
+        """Hash from a worker thread (sync endpoints), still bounded by the pool."""
+        return self._submit(pwd_context.hash, password).result()
+
+    def verify_sync(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify from a worker thread (sync endpoints), still bounded by the pool."""
+        return self._submit(pwd_context.verify, plain_password, hashed_password).result()
+
+    def stats(self) -> PasswordHasherStats:
+        with self._lock:
+            completed = self._completed
+            return PasswordHasherStats(
+                running=min(self._in_flight, self.max_workers),
+                queued=max(0, self._in_flight - self.max_workers),
+                completed=completed,
+                rejected=self._rejected,
+                avg_hash_seconds=self._hash_seconds / completed if completed else 0.0,
+                max_hash_seconds=self._max_hash_seconds,
+                avg_wait_seconds=self._wait_seconds / completed if completed else 0.0,
+            )
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE)
+
 def verify_password(plain_password: str, hash_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hash_password)
+    """Verify a plain password against a hashed password.
+
+    Blocks the calling thread; use ``await password_hasher.verify`` in async code.
+    """
+    return password_hasher.verify_sync(plain_password, hash_password)
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    return pwd_context.hash(password)
+    """Hash a password.
+
+    Blocks the calling thread; use ``await password_hasher.hash`` in async code.
+    """
+    return password_hasher.hash_sync(password)
 
 def send_email(to: str, subject: str, body: str):
     """Send an email (placeholder)."""
@@ -55,17 +172,54 @@ def validate_password_complexity(password: str) -> bool:
     return True
 
 class TokenBlacklist:
-    def __init__(self):
-        self._blacklist = set()
+    """Revoked token ids, each kept only until the token would have expired anyway.
+
+    Entries live in the key-value store with a TTL, so revocations are seen by every worker
+    sharing the store and memory stays flat; lookups are a single key check.
+    """
+
+    def __init__(self, store: KeyValueStore | None = None):
+        self._store = (kv_store if store is None else store).namespaced("revoked-jti")
 
     def add_to_blacklist(self, jti: str, exp: datetime):
-        self._blacklist.add(jti)
+        if exp.tzinfo is None:
+            exp = exp.replace(tzinfo=timezone.utc)
+        ttl = (exp - datetime.now(timezone.utc)).total_seconds()
+        # An already-expired token is rejected by jwt.decode; nothing to remember
+        if jti and ttl > 0:
+            self._store.set(jti, "1", ttl=ttl)
 
     def is_blacklisted(self, jti: str) -> bool:
-        return jti in self._blacklist
+        return bool(jti) and self._store.exists(jti)
 
 token_blacklist = TokenBlacklist()
 
+class PrincipalCache:
+    """Short-lived snapshot of the user behind a token subject, so authentication skips the DB.
+
+    Only identity and permission columns are cached; ``crud_user`` invalidates the entry when the
+    user is updated or deleted, and logout drops it as well.
+    """
+
+    FIELDS = ("id", "email", "name", "is_active", "is_superuser", "roles")
+
+    def __init__(self, ttl: int = settings.PRINCIPAL_CACHE_TTL, store: KeyValueStore | None = None):
+        self.ttl = ttl
+        self._store = (kv_store if store is None else store).namespaced("principal")
+
+    def get(self, subject: str) -> dict | None:
+        principal = self._store.get_json(subject)
+        CACHE_LOOKUPS.labels("principal", "miss" if principal is None else "hit").inc()
+        return principal
+
+    def set(self, subject: str, user) -> None:
+        self._store.set_json(subject, {field: getattr(user, field) for field in self.FIELDS}, ttl=self.ttl)
+
+    def invalidate(self, *subjects: str) -> None:
+        self._store.delete(*subjects)
+
+principal_cache = PrincipalCache()
+
 def create_refresh_token() -> str:
     """Create a secure refresh token."""
     return secrets.token_urlsafe(32)
@@ -0,0 +1,95 @@
+import os
+import re
+from mimetypes import guess_type
+from urllib.parse import quote
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Receive, Scope, Send
+
+# Keys written by the content-addressed storage backend: ab/cd/<sha256>[.ext]
+CONTENT_KEY = re.compile(r"[0-9a-f]{2}/[0-9a-f]{2}/(?P<sha256>[0-9a-f]{64})(?:\.[a-z0-9]{1,10})?")
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Precompressed siblings looked up for clients that accept them, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class UploadFileResponse(FileResponse):
+    """FileResponse that hands whole-file bodies to the server when it supports pathsend.
+
+    Servers implementing the ``http.response.pathsend`` ASGI extension send the file themselves
+    (typically with sendfile), so no bytes pass through Python. Ranges and servers without the
+    extension fall back to reading in 1 MiB chunks.
+    """
+
+    chunk_size = 1024 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if ("http.response.pathsend" in scope.get("extensions", {}) and scope["method"] != "HEAD"
+                and self.stat_result is not None and "range" not in Headers(scope=scope)):
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await send({"type": "http.response.pathsend", "path": os.fspath(self.path)})
+            return
+        await super().__call__(scope, receive, send)
+
+
+class UploadStaticFiles(StaticFiles):
+    """Serves the upload directory with validators and cache headers suited to its layout.
+
+    Content-addressed files never change, so their ETag is the content hash and they are
+    cached for a year as ``immutable``. Other files get a size/mtime ETag and must revalidate.
+    ``.br``/``.gz`` siblings are served to clients that accept them. With
+    ``accel_redirect_prefix`` set, file bodies are left to the fronting proxy via
+    ``X-Accel-Redirect``. Paths with dot-segments (such as the storage temp dir) are never served.
+    """
+
+    def __init__(self, *, directory: str, accel_redirect_prefix: str | None = None, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.root = os.path.realpath(directory)
+        self.accel_redirect_prefix = accel_redirect_prefix.rstrip("/") + "/" if accel_redirect_prefix else None
+
+    def lookup_path(self, path: str) -> tuple[str, os.stat_result | None]:
+        if any(part.startswith(".") for part in path.replace(os.sep, "/").split("/")):
+            return "", None
+        return super().lookup_path(path)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope,
+                      status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        relative = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+        match = CONTENT_KEY.fullmatch(relative)
+        if match:
+            etag, cache_control = match["sha256"], IMMUTABLE
+        else:
+            etag, cache_control = f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}", "no-cache"
+        media_type = guess_type(relative)[0] or "application/octet-stream"
+        headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+        if self.accel_redirect_prefix:
+            headers.update({"ETag": f'"{etag}"', "X-Accel-Redirect": self.accel_redirect_prefix + quote(relative)})
+            if self.is_not_modified(Headers(headers=headers), request_headers):
+                return NotModifiedResponse(headers)
+            return Response(status_code=status_code, headers=headers, media_type=media_type)
+
+        path = full_path
+        if "range" not in request_headers:
+            accepted = request_headers.get("accept-encoding", "")
+            for encoding, suffix in ENCODINGS:
+                if encoding in accepted:
+                    try:
+                        compressed = os.stat(f"{full_path}{suffix}")
+                    except OSError:
+                        continue
+                    path, stat_result = f"{full_path}{suffix}", compressed
+                    etag = f"{etag}-{encoding}"
+                    headers["Content-Encoding"] = encoding
+                    break
+
+        headers["ETag"] = f'"{etag}"'
+        response = UploadFileResponse(path, status_code=status_code, headers=headers, media_type=media_type,
+                                      stat_result=stat_result)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,159 @@
+import gzip
+import hashlib
+import os
+import shutil
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.exceptions import UploadTooLargeError
+
+CHUNK_SIZE = 1024 * 1024
+_EXTENSION = re.compile(r"^\.[a-z0-9]{1,10}$")
+# Text formats worth storing a .gz sibling for; images, archives and eBooks are already compressed
+COMPRESSIBLE_EXTENSIONS = frozenset({".css", ".csv", ".html", ".js", ".json", ".md", ".svg", ".txt", ".xml"})
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    """A file held by a storage backend, addressed by its content hash."""
+
+    key: str
+    url: str
+    size: int
+    sha256: str
+    created: bool  # False when identical content was already stored
+
+
+def content_key(sha256: str, extension: str) -> str:
+    """Sharded key for content, e.g. ``ab/cd/abcd1234...ef.jpg``; two levels of 256 directories."""
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def normalize_extension(filename: str) -> str:
+    """Lowercased extension of an upload's filename, or "" when missing or unusual."""
+    extension = Path(filename).suffix.lower()
+    return extension if _EXTENSION.match(extension) else ""
+
+
+class StorageBackend(ABC):
+    """Content-addressed file storage behind ``/uploads``.
+
+    Keys are derived from the content hash, so identical uploads share one object and a key's
+    content never changes. That makes URLs safe to cache forever. Methods block; call them
+    from a worker thread.
+    """
+
+    @abstractmethod
+    def save(self, source: BinaryIO, extension: str = "", max_size: int | None = None) -> StoredFile:
+        """Store the stream's content, raising UploadTooLargeError past ``max_size`` bytes."""
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO: ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def url(self, key: str) -> str: ...
+
+
+class LocalStorage(StorageBackend):
+    """Stores objects under a local directory that is served by the ``/uploads`` static mount."""
+
+    def __init__(self, root: str | Path, base_url: str = "/uploads"):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+        self.temp_dir = self.root / ".tmp"
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def open(self, key: str) -> BinaryIO:
+        return self.path(key).open("rb")
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+        self.path(f"{key}.gz").unlink(missing_ok=True)
+
+    def _precompress(self, path: Path) -> None:
+        """Write ``<path>.gz`` next to a text file so it can be served compressed without CPU per request."""
+        compressed = path.with_name(f"{path.name}.gz")
+        with path.open("rb") as source, gzip.GzipFile(compressed, "wb", compresslevel=9, mtime=0) as target:
+            shutil.copyfileobj(source, target, CHUNK_SIZE)
+        if compressed.stat().st_size >= path.stat().st_size:
+            compressed.unlink()
+        else:
+            os.chmod(compressed, 0o644)
+
+    def save(self, source: BinaryIO, extension: str = "", max_size: int | None = None) -> StoredFile:
+        """Stream ``source`` to a temporary file while hashing, then move it to its content key.
+
+        The key is only known once the last chunk is hashed, so the data is written under a
+        temporary name in the same filesystem and renamed into place. If the key already exists,
+        the copy is discarded.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=self.temp_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as target:
+                while chunk := source.read(CHUNK_SIZE):
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise UploadTooLargeError(f"File exceeds the maximum upload size of {max_size} bytes")
+                    digest.update(chunk)
+                    target.write(chunk)
+
+            sha256 = digest.hexdigest()
+            key = content_key(sha256, extension)
+            path = self.path(key)
+            created = not path.exists()
+            if created:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # mkstemp creates 0600; uploads are served to other processes (static server, proxy)
+                os.chmod(temp_name, 0o644)
+                # Concurrent uploads of the same content both land here; either rename wins intact
+                os.replace(temp_name, path)
+                if extension in COMPRESSIBLE_EXTENSIONS:
+                    self._precompress(path)
+        finally:
+            Path(temp_name).unlink(missing_ok=True)
+        return StoredFile(key=key, url=self.url(key), size=size, sha256=sha256, created=created)
+
+
+def create_storage(backend: str | None = None) -> StorageBackend:
+    """Build the backend selected by ``settings.STORAGE_BACKEND`` (currently only "local")."""
+    backend = backend or settings.STORAGE_BACKEND
+    if backend == "local":
+        return LocalStorage(settings.UPLOAD_DIR)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+storage = create_storage()
+
+
+async def save_upload(file: UploadFile, max_size: int | None = None) -> StoredFile:
+    """Store an upload by content hash, off the event loop, with constant memory."""
+    max_size = settings.MAX_UPLOAD_SIZE if max_size is None else max_size
+    if file.size is not None and file.size > max_size:
+        raise UploadTooLargeError(f"File exceeds the maximum upload size of {max_size} bytes")
+    await file.seek(0)
+    return await run_in_threadpool(storage.save, file.file, normalize_extension(file.filename or ""), max_size)
@@ -1,38 +1,198 @@
-from sqlalchemy.orm import Session
+import html
+import re
+
+from sqlalchemy import Select, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 
+from app.crud.crud_association import resolve_ids, sync_association
+from app.crud.crud_pagination import Page, page_rows_async, paginate, paginate_async
 from app.models import article as models
 from app.schemas import article as schemas
 from app.models.category import Category
+from app.models.image_derivative import ImageDerivative
 from app.models.tag import Tag
 
+# Relationships read by the article response schema, loaded in one query each
+ARTICLE_RELATIONS = (
+    selectinload(models.Article.categories),
+    selectinload(models.Article.tags),
+    selectinload(models.Article.featured_image_derivative),
+)
+
 
 def get_article(db: Session, slug: str):
-    return db.query(models.Article).filter(models.Article.slug == slug).first()
+    return db.query(models.Article).options(*ARTICLE_RELATIONS).filter(models.Article.slug == slug).first()
 
 
-def get_articles(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Article).offset(skip).limit(limit).all()
+def get_articles(db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None) -> Page:
+    query = select(models.Article).options(*ARTICLE_RELATIONS)
+    return paginate(db, query, models.Article, (models.Article.created_at,), skip, cursor, limit)
+
+
+async def get_article_async(db: AsyncSession, slug: str):
+    query = select(models.Article).options(*ARTICLE_RELATIONS).filter(models.Article.slug == slug)
+    return (await db.scalars(query)).first()
+
+
+# Orderings the article list accepts, each backed by an index that ends in (column, id)
+ARTICLE_SORTS = {
+    "published_at": models.Article.published_at,
+    "created_at": models.Article.created_at,
+}
+
+
+def filter_articles(query: Select, status: str | None = None, type: str | None = None,
+                    category: str | None = None) -> Select:
+    """Restrict an article query by status, type and category slug."""
+    if status is not None:
+        query = query.where(models.Article.status == status)
+    if type is not None:
+        query = query.where(models.Article.type == type)
+    if category is not None:
+        links = models.article_categories
+        category_id = select(Category.id).where(Category.slug == category).scalar_subquery()
+        query = query.where(models.Article.id.in_(select(links.c.article_id).where(links.c.category_id == category_id)))
+    return query
+
+
+def _sorted_list_query(query: Select, sort_by: str, **filters) -> tuple[Select, tuple]:
+    """Filtered list query plus the ``order_by`` columns for pagination; only whitelisted sorts are allowed."""
+    if sort_by not in ARTICLE_SORTS:
+        raise ValueError(f"Articles cannot be sorted by {sort_by!r}")
+    column = ARTICLE_SORTS[sort_by]
+    query = filter_articles(query, **filters)
+    if sort_by == "published_at":
+        # Never-published articles have no published_at, and keyset comparisons cannot order NULLs
+        query = query.where(column.is_not(None))
+    return query, (column,)
+
+
+async def get_articles_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: str | None = None,
+                             status: str | None = None, type: str | None = None, category: str | None = None,
+                             sort_by: str = "created_at", descending: bool = False) -> Page:
+    """Filtered page of articles ordered by a column in ``ARTICLE_SORTS``.
+
+    Raises ``ValueError`` for any other ``sort_by``.
+    """
+    query, order_by = _sorted_list_query(select(models.Article).options(*ARTICLE_RELATIONS), sort_by,
+                                         status=status, type=type, category=category)
+    return await paginate_async(db, query, models.Article, order_by, skip, cursor, limit, descending)
+
+
+# Control characters mark snippet highlights so the text can be HTML-escaped before <mark> is added
+_HIGHLIGHT_START, _HIGHLIGHT_END = "\x02", "\x03"
+_SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts5_query(text: str) -> str | None:
+    """Turn free text into a safe FTS5 query: every word required, the last one as a prefix.
+
+    User input never reaches FTS5's query syntax directly, so quotes or operators cannot cause
+    syntax errors. Returns None when the text has no searchable words.
+    """
+    tokens = _SEARCH_TOKEN.findall(text)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"' for token in tokens) + "*"
+
+
+def tsquery_prefix(text: str) -> str | None:
+    """The Postgres counterpart of ``fts5_query``, for ``to_tsquery``: 'every' & 'word':*.
+
+    ``websearch_to_tsquery`` never matches prefixes, so the query is built here from the same
+    word tokens, each single-quoted (tokens never contain quotes). None when there are no words.
+    """
+    tokens = _SEARCH_TOKEN.findall(text)
+    if not tokens:
+        return None
+    return " & ".join(f"'{token}'" for token in tokens) + ":*"
+
+
+def _render_snippet(snippet: str | None) -> str | None:
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_HIGHLIGHT_START, "<mark>").replace(_HIGHLIGHT_END, "</mark>")
+
+
+async def search_articles_async(db: AsyncSession, text: str, skip: int = 0, limit: int = 100,
+                                status: str | None = None, type: str | None = None,
+                                category: str | None = None) -> list:
+    """Full-text search over title, excerpt and content, best matches first.
+
+    Each returned article carries a ``snippet`` of the best-matching passage with the hits
+    wrapped in ``<mark>``. SQLite ranks with FTS5's BM25; Postgres with ``ts_rank_cd``.
+    Every word must match and the last one matches as a prefix, so results appear while typing.
+    The list filters apply as in ``get_articles_async``.
+    """
+    article = models.Article
+    if db.bind.dialect.name == "postgresql":
+        tsquery = tsquery_prefix(text)
+        if tsquery is None:
+            return []
+        search_query = func.to_tsquery("english", tsquery)
+        vector = literal_column("articles.search_vector")
+        snippet = func.ts_headline(
+            "english", func.coalesce(article.content, article.excerpt, article.title), search_query,
+            f"StartSel={_HIGHLIGHT_START}, StopSel={_HIGHLIGHT_END}, MaxWords=35, MinWords=15, MaxFragments=2",
+        )
+        query = (
+            select(article, snippet)
+            .where(vector.op("@@")(search_query))
+            .order_by(func.ts_rank_cd(vector, search_query).desc(), article.id)
+        )
+    else:
+        match = fts5_query(text)
+        if match is None:
+            return []
+        fts = models.articles_fts
+        # -1 lets FTS5 pick the column with the best match for the snippet
+        snippet = func.snippet(literal_column("articles_fts"), -1, _HIGHLIGHT_START, _HIGHLIGHT_END, "…", 24)
+        query = (
+            select(article, snippet)
+            .join(fts, fts.c.rowid == article.id)
+            .where(literal_column("articles_fts").op("MATCH")(match))
+            .order_by(fts.c.rank, article.id)
+        )
+
+    query = filter_articles(query, status=status, type=type, category=category)
+    rows = (await db.execute(query.options(*ARTICLE_RELATIONS).offset(skip).limit(limit))).all()
+    results = []
+    for row_article, row_snippet in rows:
+        row_article.snippet = _render_snippet(row_snippet)
+        results.append(row_article)
+    return results
+
+
+async def get_article_page_versions_async(db: AsyncSession, skip: int = 0, limit: int = 100,
+                                          cursor: str | None = None, status: str | None = None,
+                                          type: str | None = None, category: str | None = None,
+                                          sort_by: str = "created_at", descending: bool = False) -> list:
+    """(id, updated_at, featured derivative updated_at) for the rows ``get_articles_async`` would return."""
+    query = (
+        select(models.Article.id, models.Article.updated_at, ImageDerivative.updated_at)
+        .outerjoin(ImageDerivative, ImageDerivative.source_url == models.Article.featured_image_url)
+    )
+    query, order_by = _sorted_list_query(query, sort_by, status=status, type=type, category=category)
+    return await page_rows_async(db, query, models.Article, order_by, skip, cursor, limit, descending)
 
 
 def create_article(db: Session, article: schemas.ArticleCreate, user_id: int):
     article_data = article.model_dump(exclude_unset=True)
-    category_ids = article_data.pop("category_ids", [])
-    tag_ids = article_data.pop("tag_ids", [])
+    category_ids = resolve_ids(db, Category, article_data.pop("category_ids", []), "category")
+    tag_ids = resolve_ids(db, Tag, article_data.pop("tag_ids", []), "tag")
 
     db_article = models.Article(**article_data, author_id=user_id)
-
-    for category_id in category_ids:
-        category = db.query(Category).filter(Category.id == category_id).first()
-        if category:
-            db_article.categories.append(category)
-
-    for tag_id in tag_ids:
-        tag = db.query(Tag).filter(Tag.id == tag_id).first()
-        if tag:
-            db_article.tags.append(tag)
-
+    if db_article.status == "published" and db_article.published_at is None:
+        db_article.published_at = func.now()
     db.add(db_article)
+    db.flush()
+
+    sync_association(db, models.article_categories, "article_id", db_article.id,
+                     "category_id", category_ids, current_ids=set())
+    sync_association(db, models.article_tags, "article_id", db_article.id,
+                     "tag_id", tag_ids, current_ids=set())
     db.commit()
     db.refresh(db_article)
     return db_article
@@ -40,25 +200,30 @@ def create_article(db: Session, article: schemas.ArticleCreate, user_id: int):
 
 def update_article(db: Session, db_article: models.Article, article_in: schemas.ArticleUpdate):
     update_data = article_in.model_dump(exclude_unset=True)
-
-    if "category_ids" in update_data:
-        new_category_ids = update_data.pop("category_ids")
-        db_article.categories = []  # Clear existing categories
-        for category_id in new_category_ids:
-            category = db.query(Category).filter(Category.id == category_id).first()
-            if category:
-                db_article.categories.append(category)
-
-    if "tag_ids" in update_data:
-        new_tag_ids = update_data.pop("tag_ids")
-        db_article.tags = []  # Clear existing tags
-        for tag_id in new_tag_ids:
-            tag = db.query(Tag).filter(Tag.id == tag_id).first()
-            if tag:
-                db_article.tags.append(tag)
+    category_ids = update_data.pop("category_ids", None)
+    tag_ids = update_data.pop("tag_ids", None)
+
+    # Validate both id lists before touching any association rows
+    if category_ids is not None:
+        category_ids = resolve_ids(db, Category, category_ids, "category")
+    if tag_ids is not None:
+        tag_ids = resolve_ids(db, Tag, tag_ids, "tag")
+
+    if category_ids is not None:
+        sync_association(db, models.article_categories, "article_id", db_article.id,
+                         "category_id", category_ids)
+    if tag_ids is not None:
+        sync_association(db, models.article_tags, "article_id", db_article.id,
+                         "tag_id", tag_ids)
+    if category_ids is not None or tag_ids is not None:
+        # Association rows live in other tables; bump the row so its validators change too
+        db_article.updated_at = func.now()
 
     for field, value in update_data.items():
         setattr(db_article, field, value)
+    # The first publication is what published_at records; unpublishing keeps it
+    if db_article.status == "published" and db_article.published_at is None:
+        db_article.published_at = func.now()
 
     db.add(db_article)
     db.commit()
@@ -0,0 +1,43 @@
+from collections.abc import Iterable
+
+from sqlalchemy import Table, delete, insert, select
+from sqlalchemy.orm import Session
+
+
+def resolve_ids(db: Session, model, ids: Iterable[int], label: str) -> list[int]:
+    """Check that every id exists with one IN query; return them de-duplicated in order."""
+    wanted = list(dict.fromkeys(ids))
+    if not wanted:
+        return []
+    found = set(db.scalars(select(model.id).where(model.id.in_(wanted))))
+    missing = [item_id for item_id in wanted if item_id not in found]
+    if missing:
+        raise ValueError(f"Unknown {label} ids: {missing}")
+    return wanted
+
+
+def sync_association(
+        db: Session,
+        table: Table,
+        owner_column: str,
+        owner_id: int,
+        target_column: str,
+        target_ids: list[int],
+        current_ids: set[int] | None = None,
+) -> None:
+    """Bring an association table in line with target_ids, writing only the rows that change.
+
+    Pass ``current_ids`` when the stored rows are already known (e.g. an empty set for a new owner).
+    """
+    owner = table.c[owner_column]
+    target = table.c[target_column]
+    if current_ids is None:
+        current_ids = set(db.scalars(select(target).where(owner == owner_id)))
+
+    removed = current_ids.difference(target_ids)
+    added = [target_id for target_id in target_ids if target_id not in current_ids]
+
+    if removed:
+        db.execute(delete(table).where(owner == owner_id, target.in_(removed)))
+    if added:
+        db.execute(insert(table), [{owner_column: owner_id, target_column: target_id} for target_id in added])
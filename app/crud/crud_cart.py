@@ -1,14 +1,69 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager
 
 from app.models.cart import Cart
 from app.models.cart_item import CartItem
+from app.models.product import Product
 from app.schemas.cart import CartCreate
 from app.schemas.cart_item import CartItemCreate, CartItemUpdate
 
 
+# INSERT constructs with ON CONFLICT support, per dialect
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _upsert_insert(bind):
+    try:
+        return _UPSERT_INSERTS[bind.dialect.name]
+    except KeyError:
+        raise RuntimeError(f"Cart upserts are not supported on {bind.dialect.name}")
+
+
 def get_cart_by_user_id(db: Session, user_id: int) -> Cart | None:
     return db.query(Cart).filter(Cart.user_id == user_id).first()
 
+def get_or_create_cart_id(db: Session, user_id: int) -> int:
+    """Id of the user's cart, creating it if missing; concurrent first requests end up with the same cart."""
+    cart_id = db.scalar(select(Cart.id).where(Cart.user_id == user_id))
+    if cart_id is None:
+        insert = _upsert_insert(db.bind)
+        db.execute(insert(Cart).values(user_id=user_id).on_conflict_do_nothing(index_elements=[Cart.user_id]))
+        cart_id = db.scalar(select(Cart.id).where(Cart.user_id == user_id))
+    return cart_id
+
+def add_cart_item(db: Session, cart_id: int, product_id: int, quantity: int) -> tuple[CartItem | None, bool]:
+    """Add ``quantity`` of a product to a cart; returns the line (None if the product does not exist)
+    and whether it was newly created.
+
+    ``INSERT ... SELECT FROM products ... ON CONFLICT (cart_id, product_id) DO NOTHING RETURNING``
+    creates the line; selecting from products doubles as the existence check. When the line already
+    exists, one ``UPDATE ... SET quantity = quantity + n RETURNING`` increases it. Each statement is
+    atomic, so concurrent adds of the same product all count.
+    """
+    insert = _upsert_insert(db.bind)
+    source = select(literal(cart_id), Product.id, literal(quantity)).where(Product.id == product_id)
+    statement = (
+        insert(CartItem).from_select(["cart_id", "product_id", "quantity"], source)
+        .on_conflict_do_nothing(index_elements=[CartItem.cart_id, CartItem.product_id])
+        .returning(CartItem)
+    )
+    db_cart_item = db.scalars(statement, execution_options={"populate_existing": True}).first()
+    created = db_cart_item is not None
+    if not created:
+        # Either the line exists or the product does not; the UPDATE matches nothing in the latter case
+        statement = (
+            update(CartItem)
+            .where(CartItem.cart_id == cart_id, CartItem.product_id == product_id)
+            .values(quantity=func.coalesce(CartItem.quantity, 0) + quantity)
+            .returning(CartItem)
+        )
+        db_cart_item = db.scalars(statement, execution_options={"populate_existing": True}).first()
+    db.commit()
+    return db_cart_item, created
+
 def create_cart(db: Session, cart: CartCreate) -> Cart:
     db_cart = Cart(**cart.model_dump())
     db.add(db_cart)
@@ -16,6 +71,27 @@ def create_cart(db: Session, cart: CartCreate) -> Cart:
     db.refresh(db_cart)
     return db_cart
 
+async def get_cart_by_user_id_async(db: AsyncSession, user_id: int) -> Cart | None:
+    """The user's cart with its items and their products, from one outer-joined query."""
+    # Loaded up front: lazy loading is not available on an AsyncSession
+    query = (
+        select(Cart)
+        .outerjoin(Cart.items)
+        .outerjoin(CartItem.product)
+        .options(contains_eager(Cart.items).contains_eager(CartItem.product))
+        .where(Cart.user_id == user_id)
+        .order_by(CartItem.id)
+        .execution_options(populate_existing=True)
+    )
+    return (await db.scalars(query)).unique().first()
+
+async def create_cart_async(db: AsyncSession, cart: CartCreate) -> Cart:
+    """Create the user's cart unless a concurrent request already has, and return it."""
+    insert = _upsert_insert(db.bind)
+    await db.execute(insert(Cart).values(**cart.model_dump()).on_conflict_do_nothing(index_elements=[Cart.user_id]))
+    await db.commit()
+    return await get_cart_by_user_id_async(db, cart.user_id)
+
 def get_cart_item(db: Session, cart_item_id: int) -> CartItem | None:
     return db.query(CartItem).filter(CartItem.id == cart_item_id).first()
 
@@ -27,10 +103,15 @@ def create_cart_item(db: Session, cart_item: CartItemCreate, cart_id: int) -> Ca
     return db_cart_item
 
 def update_cart_item(db: Session, cart_item: CartItem, cart_item_in: CartItemUpdate) -> CartItem:
+    """Update a cart line; raises ``ValueError`` if it would repeat a product already in the cart."""
     for field, value in cart_item_in.model_dump(exclude_unset=True).items():
         setattr(cart_item, field, value)
     db.add(cart_item)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("Product is already in the cart; update that item instead")
     db.refresh(cart_item)
     return cart_item
 
@@ -1,5 +1,7 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.crud.crud_pagination import Page, paginate
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
@@ -10,8 +12,8 @@ def get_category(db: Session, category_id: int) -> Category | None:
 def get_category_by_slug(db: Session, slug: str) -> Category | None:
     return db.query(Category).filter(Category.slug == slug).first()
 
-def get_categories(db: Session, skip: int = 0, limit: int = 100) -> list[Category]:
-    return db.query(Category).offset(skip).limit(limit).all()
+def get_categories(db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None) -> Page:
+    return paginate(db, select(Category), Category, (), skip, cursor, limit)
 
 def create_category(db: Session, category: CategoryCreate) -> Category:
     db_category = Category(**category.model_dump())
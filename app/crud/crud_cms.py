@@ -0,0 +1,129 @@
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import cms_cache
+from app.models.menu import Menu
+from app.models.menu_item import MenuItem
+from app.models.page import Page
+from app.models.site_setting import SiteSetting
+from app.schemas import cms as schemas
+
+MENU_PREFIX = "menu:"
+PAGE_PREFIX = "page:"
+SITE_SETTINGS_KEY = "site-settings"
+
+
+def get_menu_tree(db: Session, location_slug: str) -> schemas.Menu | None:
+    """Return the menu at a location with its items nested under their parents.
+
+    The menu and all of its items are read in a single query and assembled in O(n);
+    the result is cached until a menu or menu item is committed.
+    """
+    key = f"{MENU_PREFIX}{location_slug}"
+    cached = cms_cache.get(key)
+    if cached is not None:
+        return cached
+
+    rows = db.execute(
+        select(Menu.name, MenuItem.id, MenuItem.parent_id, MenuItem.title, MenuItem.url)
+        .outerjoin(MenuItem, MenuItem.menu_id == Menu.id)
+        .where(Menu.location_slug == location_slug)
+        .order_by(MenuItem.order, MenuItem.id)
+    ).all()
+    if not rows:
+        return None
+
+    items = [row for row in rows if row.id is not None]
+    nodes = {row.id: schemas.MenuItem(title=row.title, url=row.url, children=[]) for row in items}
+    roots: list[schemas.MenuItem] = []
+    for row in items:
+        parent = nodes.get(row.parent_id)
+        # Items whose parent is missing or belongs to another menu are shown at the top level
+        if parent is None or row.parent_id == row.id:
+            roots.append(nodes[row.id])
+        else:
+            parent.children.append(nodes[row.id])
+
+    menu = schemas.Menu(name=rows[0].name, items=roots)
+    cms_cache.set(key, menu)
+    return menu
+
+
+def get_page(db: Session, slug: str) -> schemas.Page | None:
+    """Return a page by slug, served from the CMS cache when possible."""
+    key = f"{PAGE_PREFIX}{slug}"
+    cached = cms_cache.get(key)
+    if cached is not None:
+        return cached
+
+    page = db.query(Page).filter(Page.slug == slug).first()
+    if not page:
+        return None
+    result = schemas.Page.model_validate(page)
+    cms_cache.set(key, result)
+    return result
+
+
+def get_site_settings(db: Session) -> dict[str, str | None]:
+    """Return all site settings as key-value pairs, served from the CMS cache when possible."""
+    cached = cms_cache.get(SITE_SETTINGS_KEY)
+    if cached is not None:
+        return cached
+
+    result = {s.key: s.value for s in db.query(SiteSetting).all()}
+    cms_cache.set(SITE_SETTINGS_KEY, result)
+    return result
+
+
+def invalidate_menu_cache(location_slug: str | None = None) -> None:
+    """Drop a cached menu tree, or all of them when no slug is given."""
+    if location_slug is None:
+        cms_cache.invalidate_prefix(MENU_PREFIX)
+    else:
+        cms_cache.invalidate(f"{MENU_PREFIX}{location_slug}")
+
+
+def invalidate_page_cache(slug: str | None = None) -> None:
+    """Drop a cached page, or all of them when no slug is given."""
+    if slug is None:
+        cms_cache.invalidate_prefix(PAGE_PREFIX)
+    else:
+        cms_cache.invalidate(f"{PAGE_PREFIX}{slug}")
+
+
+def invalidate_site_settings_cache() -> None:
+    cms_cache.invalidate(SITE_SETTINGS_KEY)
+
+
+# ORM writes to CMS models are recorded on the session and invalidated once committed, so a
+# concurrent read in this process cannot re-cache the pre-commit state. ``cms_cache`` is per
+# process: other workers keep serving their cached copy until it expires, i.e. for up to
+# ``settings.CMS_CACHE_TTL`` seconds after the commit.
+_INVALIDATORS = {
+    Menu: invalidate_menu_cache,
+    MenuItem: invalidate_menu_cache,
+    Page: invalidate_page_cache,
+    SiteSetting: invalidate_site_settings_cache,
+}
+
+
+def _mark_cms_changed(mapper, connection, target) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("cms_changed", set()).add(_INVALIDATORS[mapper.class_])
+
+
+for _model in _INVALIDATORS:
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _mark_cms_changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cms_after_commit(session: Session) -> None:
+    for invalidate in session.info.pop("cms_changed", ()):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_cms_changes(session: Session) -> None:
+    session.info.pop("cms_changed", None)
@@ -0,0 +1,33 @@
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.image_derivative import ImageDerivative
+
+
+async def get_image_derivative_async(db: AsyncSession, source_url: str) -> ImageDerivative | None:
+    query = select(ImageDerivative).filter(ImageDerivative.source_url == source_url)
+    return (await db.scalars(query)).first()
+
+async def save_image_derivative_async(db: AsyncSession, source_url: str, status: str,
+                                      variants: dict[str, str] | None = None,
+                                      error: str | None = None) -> ImageDerivative:
+    """Create or update the derivative record for an image."""
+    for attempt in range(2):
+        derivative = await get_image_derivative_async(db, source_url)
+        if derivative is None:
+            derivative = ImageDerivative(source_url=source_url)
+            db.add(derivative)
+        derivative.status = status
+        derivative.variants = variants or {}
+        derivative.error = error
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another worker inserted the same source concurrently; update its row instead
+            await db.rollback()
+            if attempt:
+                raise
+            continue
+        await db.refresh(derivative)
+        return derivative
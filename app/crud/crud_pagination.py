@@ -0,0 +1,146 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, NamedTuple
+
+from sqlalchemy import DateTime, Select, String, literal, tuple_, type_coerce
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import InvalidCursorError
+
+
+class Page(NamedTuple):
+    """One page of rows plus the opaque cursor for the page after it (None on the last page)."""
+
+    items: list[Any]
+    next_cursor: str | None
+
+
+def _sort_key(model, order_by: tuple, descending: bool) -> str:
+    columns = ",".join(column.key for column in order_by)
+    return f"{model.__tablename__}:{columns}:{'desc' if descending else 'asc'}"
+
+
+class _CursorDateTime(TypeDecorator):
+    """Binds a cursor datetime exactly as the database returned it.
+
+    SQLite stores datetimes as text and compares them as text, in whatever form they were
+    written: ``CURRENT_TIMESTAMP`` defaults have no fraction, values written through ``DateTime``
+    always have six digits. Only the stored text itself compares equal to its row, so on SQLite
+    the cursor carries that text and it is bound unchanged; elsewhere it is parsed back.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        return dialect.type_descriptor(String() if dialect.name == "sqlite" else self.impl)
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "sqlite":
+            return value
+        return datetime.fromisoformat(value)
+
+
+def _cursor_literal(value: Any, column):
+    if isinstance(column.type, DateTime):
+        return literal(value, _CursorDateTime(timezone=column.type.timezone))
+    return literal(value, column.type)
+
+
+def _stored_values(order_by: tuple) -> list:
+    """The sort columns as the database returns them, read alongside each page row for its cursor."""
+    return [
+        (type_coerce(column, String) if isinstance(column.type, DateTime) else column).label(f"cursor_{column.key}")
+        for column in order_by
+    ]
+
+
+def _dump_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _check_value(value: Any, column) -> Any:
+    """Reject a cursor datetime that is not a timestamp; it is kept as text and bound as such."""
+    if isinstance(column.type, DateTime) and value is not None:
+        datetime.fromisoformat(value)
+    return value
+
+
+def encode_cursor(key: str, last_values: list, last_id: int) -> str:
+    data = {"k": key, "v": [_dump_value(value) for value in last_values], "id": last_id}
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, key: str, order_by: tuple) -> tuple[list, int]:
+    """Return the last row's sort values and id stored in a cursor, rejecting cursors issued for another ordering."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        values, last_id = data["v"], data["id"]
+        last_values = [_check_value(value, column) for value, column in zip(values, order_by)]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursorError()
+    if data.get("k") != key or not isinstance(last_id, int) or len(last_values) != len(order_by):
+        raise InvalidCursorError()
+    return last_values, last_id
+
+
+def _page_query(query: Select, model, order_by: tuple, descending: bool,
+                skip: int, cursor: str | None, limit: int) -> Select:
+    """Order by (*order_by, id) and seek past the cursor row instead of using OFFSET.
+
+    The cursor carries the last row's stored sort values as well as its id, so the seek still
+    works after that row has been deleted or edited.
+    """
+    key_columns = (*order_by, model.id)
+    if cursor is not None:
+        last_values, last_id = decode_cursor(cursor, _sort_key(model, order_by, descending), order_by)
+        bound = [_cursor_literal(value, column) for value, column in zip(last_values, order_by)]
+        current, last = tuple_(*key_columns), tuple_(*bound, literal(last_id, model.id.type))
+        query = query.where(current < last if descending else current > last)
+    elif skip:
+        query = query.offset(skip)
+
+    ordering = [column.desc() if descending else column.asc() for column in key_columns]
+    # Fetch one extra row to know whether another page exists
+    return query.order_by(*ordering).limit(limit + 1)
+
+
+def _to_page(rows: list, model, order_by: tuple, descending: bool, limit: int) -> Page:
+    """Page of the entities in ``rows``, each row being (entity, *its stored sort values)."""
+    items = [row[0] for row in rows[:limit]]
+    if len(rows) <= limit:
+        return Page(items, None)
+    last_values = list(rows[limit - 1][1:])
+    return Page(items, encode_cursor(_sort_key(model, order_by, descending), last_values, items[-1].id))
+
+
+def paginate(db: Session, query: Select, model, order_by: tuple = (), skip: int = 0,
+             cursor: str | None = None, limit: int = 100, descending: bool = False) -> Page:
+    """Run a list query as a keyset page ordered by ``order_by`` plus ``model.id``."""
+    page_query = _page_query(query, model, order_by, descending, skip, cursor, limit)
+    rows = db.execute(page_query.add_columns(*_stored_values(order_by))).all()
+    return _to_page(rows, model, order_by, descending, limit)
+
+
+async def page_rows_async(db: AsyncSession, query: Select, model, order_by: tuple = (), skip: int = 0,
+                          cursor: str | None = None, limit: int = 100, descending: bool = False) -> list:
+    """Rows of the page ``paginate_async`` would return for a column (not entity) query, plus the lookahead row.
+
+    Used to read cheap per-row columns (ids, timestamps) for exactly the rows of a page.
+    """
+    page_query = _page_query(query, model, order_by, descending, skip, cursor, limit)
+    return list((await db.execute(page_query)).all())
+
+
+async def paginate_async(db: AsyncSession, query: Select, model, order_by: tuple = (), skip: int = 0,
+                         cursor: str | None = None, limit: int = 100, descending: bool = False) -> Page:
+    """Async counterpart of ``paginate``."""
+    page_query = _page_query(query, model, order_by, descending, skip, cursor, limit)
+    rows = (await db.execute(page_query.add_columns(*_stored_values(order_by)))).all()
+    return _to_page(rows, model, order_by, descending, limit)
@@ -1,5 +1,7 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.crud.crud_pagination import Page, paginate
 from app.models.payment import Payment
 from app.schemas.payment import PaymentCreate, PaymentUpdate
 
@@ -7,8 +9,9 @@ from app.schemas.payment import PaymentCreate, PaymentUpdate
 def get_payment(db: Session, payment_id: int) -> Payment | None:
     return db.query(Payment).filter(Payment.id == payment_id).first()
 
-def get_payments_by_invoice(db: Session, invoice_id: int, skip: int = 0, limit: int = 100) -> list[Payment]:
-    return db.query(Payment).filter(Payment.invoice_id == invoice_id).offset(skip).limit(limit).all()
+def get_payments_by_invoice(db: Session, invoice_id: int, skip: int = 0, limit: int = 100,
+                            cursor: str | None = None) -> Page:
+    return paginate(db, select(Payment).filter(Payment.invoice_id == invoice_id), Payment, (), skip, cursor, limit)
 
 def create_payment(db: Session, payment: PaymentCreate) -> Payment:
     db_payment = Payment(**payment.model_dump())
@@ -1,16 +1,34 @@
-from sqlalchemy.orm import Session
+from typing import NamedTuple
 
+from sqlalchemy import case, exists, func, literal_column, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.cache import catalog_cache
+from app.crud.crud_association import resolve_ids, sync_association
+from app.crud.crud_pagination import Page, paginate, paginate_async
+from app.crud.crud_review import RATING_COLUMNS
 from app.models import product
 from app.models.category import Category
+from app.models.image_derivative import ImageDerivative
 from app.models.tag import Tag
 from app.schemas import product as schemas
 
+# Rating aggregates, kept up to date by review writes
+RATING_AGGREGATES = (product.Product.rating_count, product.Product.rating_sum, *RATING_COLUMNS.values())
+
+# Relationships read by the product response schema, loaded in one query each
+PRODUCT_RELATIONS = (
+    selectinload(product.Product.categories),
+    selectinload(product.Product.tags),
+    selectinload(product.Product.cover_image_derivative),
+)
 
 def get_product(db: Session,
                 product_id: int | None = None,
                 slug: str | None = None) -> product.Product | None:
     """Retrieve a single product by ID or slug."""
-    query = db.query(product.Product)
+    query = db.query(product.Product).options(*PRODUCT_RELATIONS)
     if product_id is not None:
         return query.filter(product.Product.id == product_id).first()
     if slug is not None:
@@ -19,32 +37,207 @@ def get_product(db: Session,
 
 def get_products(db: Session,
                  skip: int = 0,
-                 limit: int = 100):
-    """Retrieve multiple products."""
-    return db.query(product.Product).offset(skip).limit(limit).all()
+                 limit: int = 100,
+                 cursor: str | None = None) -> Page:
+    """Retrieve multiple products, oldest first."""
+    query = select(product.Product).options(*PRODUCT_RELATIONS)
+    return paginate(db, query, product.Product, (product.Product.created_at,), skip, cursor, limit)
+
+async def get_product_async(db: AsyncSession,
+                            product_id: int | None = None,
+                            slug: str | None = None) -> product.Product | None:
+    """Retrieve a single product by ID or slug without blocking the event loop."""
+    query = select(product.Product).options(*PRODUCT_RELATIONS)
+    if product_id is not None:
+        return (await db.scalars(query.filter(product.Product.id == product_id))).first()
+    if slug is not None:
+        return (await db.scalars(query.filter(product.Product.slug == slug))).first()
+    return None
+
+async def get_product_version_async(db: AsyncSession, slug: str):
+    """(id, updated_at, rating aggregates, cover derivative updated_at) of a product, without loading it.
+
+    None if missing. The rating aggregates are part of the version because review writes change
+    them within the same second, and ``updated_at`` only has whole-second resolution on SQLite.
+    """
+    query = (
+        select(product.Product.id, product.Product.updated_at, *RATING_AGGREGATES, ImageDerivative.updated_at)
+        .outerjoin(ImageDerivative, ImageDerivative.source_url == product.Product.cover_image_url)
+        .filter(product.Product.slug == slug)
+    )
+    return (await db.execute(query)).first()
+
+# Price facet buckets as (label, exclusive upper bound); the last bucket is open-ended
+PRICE_RANGES = (("0-10", 10), ("10-25", 25), ("25-50", 50), ("50-100", 100), ("100-", None))
+# Category and tag facets list only their most common values
+FACET_LIMIT = 50
+FACETS = ("price", "language", "format", "status", "is_featured", "category", "tag")
+# Above this many matches, link filters are probed per product in page order instead of sorted
+SORTED_MATCH_LIMIT = 10_000
+
+
+class SearchResult(NamedTuple):
+    page: Page
+    total: int
+    facets: dict[str, list[dict]]
+
+
+def _filter_clauses(filters: schemas.ProductSearchFilters, correlated: bool = False) -> dict[str, list]:
+    """WHERE clauses per filter dimension, so each facet can apply every dimension but its own.
+
+    Category and tag filters are ``id IN (...)`` by default, which reads the matching links once;
+    ``correlated`` makes them ``EXISTS`` probes per product instead, which is cheaper when walking
+    products in index order and stopping after a page of matches.
+    """
+    Product = product.Product
+    clauses: dict[str, list] = {name: [] for name in FACETS}
+    if filters.min_price is not None:
+        clauses["price"].append(Product.price >= filters.min_price)
+    if filters.max_price is not None:
+        clauses["price"].append(Product.price <= filters.max_price)
+    for name in ("language", "format", "status", "is_featured"):
+        value = getattr(filters, name)
+        if value is not None:
+            clauses[name].append(getattr(Product, name) == value)
+
+    def linked(links, *conditions):
+        if correlated:
+            return exists().where(links.c.product_id == Product.id, *conditions)
+        return Product.id.in_(select(links.c.product_id).where(*conditions))
+
+    if filters.category is not None:
+        # The category and all of its descendants, however deep
+        tree = select(Category.id).where(Category.slug == filters.category).cte("category_tree", recursive=True)
+        tree = tree.union_all(select(Category.id).where(Category.parent_id == tree.c.id))
+        links = product.product_categories
+        clauses["category"].append(linked(links, links.c.category_id.in_(select(tree.c.id))))
+    if filters.tag is not None:
+        links = product.product_tags
+        tag_id = select(Tag.id).where(Tag.slug == filters.tag).scalar_subquery()
+        clauses["tag"].append(linked(links, links.c.tag_id == tag_id))
+    return clauses
+
+
+def _facet_counts_query(clauses: dict[str, list]):
+    """All facet counts and the total as one UNION ALL of GROUP BYs, yielding (facet, value, count) rows.
+
+    Each branch applies every filter except its own dimension's, so the counts show what selecting
+    another value of that dimension would return. Grouped values are inlined literals rather than bound
+    parameters so that the GROUP BY expression matches the selected one on every dialect.
+    """
+    Product = product.Product
+
+    def where(exclude: str | None = None) -> list:
+        return [clause for name, items in clauses.items() if name != exclude for clause in items]
+
+    def column_branch(name: str, value):
+        return (select(literal_column(f"'{name}'").label("facet"), value.label("value"), func.count().label("count"))
+                .where(*where(name)).group_by(value))
+
+    def link_branch(name: str, links, key, target):
+        """Most common categories or tags, counted from the link table's reverse index."""
+        counts = select(key.label("id"), func.count().label("count")).select_from(links)
+        if where(name):
+            # Only join products when a filter needs their columns
+            counts = counts.join(Product, Product.id == links.c.product_id).where(*where(name))
+        # SQLite only allows ORDER BY / LIMIT in a compound member when it is wrapped in a subquery
+        counts = counts.group_by(key).order_by(func.count().desc(), key).limit(FACET_LIMIT).subquery()
+        return select(literal_column(f"'{name}'"), target.slug, counts.c.count).join_from(
+            counts, target, target.id == counts.c.id)
+
+    price_bucket = case(
+        *[(Product.price < literal_column(str(upper)), literal_column(f"'{label}'"))
+          for label, upper in PRICE_RANGES if upper is not None],
+        else_=literal_column(f"'{PRICE_RANGES[-1][0]}'"),
+    )
+    featured = case((Product.is_featured, literal_column("'true'")), else_=literal_column("'false'"))
+    category_links, tag_links = product.product_categories, product.product_tags
+    total = select(literal_column("'total'"), literal_column("NULL"), func.count()).select_from(Product).where(*where())
+    return union_all(
+        column_branch("price", price_bucket),
+        column_branch("language", Product.language),
+        column_branch("format", Product.format),
+        column_branch("status", Product.status),
+        column_branch("is_featured", featured),
+        link_branch("category", category_links, category_links.c.category_id, Category),
+        link_branch("tag", tag_links, tag_links.c.tag_id, Tag),
+        total,
+    )
+
+
+async def get_facet_counts_async(db: AsyncSession,
+                                 filters: schemas.ProductSearchFilters) -> tuple[int, dict[str, list[dict]]]:
+    """(total, facets) for a filter combination, cached per combination in ``catalog_cache``.
+
+    The counts aggregate every matching product, so uncached they cost a scan of the filtered
+    catalog; they are computed in one statement and reused until a product is written or the
+    entry expires.
+    """
+    key = ("facets", *filters.model_dump().items())
+    cached = catalog_cache.get(key)
+    if cached is not None:
+        return cached
+
+    facets: dict[str, list[dict]] = {name: [] for name in FACETS}
+    total = 0
+    for facet, value, count in (await db.execute(_facet_counts_query(_filter_clauses(filters)))).all():
+        if facet == "total":
+            total = count
+        elif value is not None:
+            facets[facet].append({"value": value, "count": count})
+    for values in facets.values():
+        values.sort(key=lambda item: (-item["count"], item["value"]))
+    catalog_cache.set(key, (total, facets))
+    return total, facets
+
+
+async def search_products_async(db: AsyncSession,
+                                filters: schemas.ProductSearchFilters,
+                                skip: int = 0,
+                                limit: int = 100,
+                                cursor: str | None = None) -> SearchResult:
+    """Filter the catalog: one query for the page, plus one for all facet counts unless they are cached.
+
+    The total is known before the page is read, so category and tag filters can pick their
+    form: a few matches are cheapest collected and sorted, many are cheapest found by walking
+    products in page order until the page is full.
+    """
+    total, facets = await get_facet_counts_async(db, filters)
+    clauses = _filter_clauses(filters, correlated=total > SORTED_MATCH_LIMIT)
+    query = select(product.Product).options(*PRODUCT_RELATIONS).where(
+        *[clause for items in clauses.values() for clause in items])
+    page = await paginate_async(db, query, product.Product, (product.Product.created_at,), skip, cursor, limit)
+    return SearchResult(page, total, facets)
+
+async def get_products_async(db: AsyncSession,
+                             skip: int = 0,
+                             limit: int = 100,
+                             cursor: str | None = None) -> Page:
+    """Retrieve multiple products without blocking the event loop."""
+    query = select(product.Product).options(*PRODUCT_RELATIONS)
+    return await paginate_async(db, query, product.Product, (product.Product.created_at,), skip, cursor, limit)
 
 
 def create_product(db: Session,
                    product_in: schemas.ProductCreate) -> product.Product:
-    """Create a new product."""
+    """Create a new product.
+
+    Raises ``ValueError`` if any category or tag id does not exist.
+    """
     product_data = product_in.model_dump(exclude_unset=True)
-    category_ids = product_data.pop('category_ids', [])
-    tag_ids = product_data.pop('tag_ids', [])
+    category_ids = resolve_ids(db, Category, product_data.pop('category_ids', []), "category")
+    tag_ids = resolve_ids(db, Tag, product_data.pop('tag_ids', []), "tag")
 
     db_product = product.Product(**product_data)
-
-    for category_id in category_ids:
-        category = db.query(Category).filter(Category.id == category_id).first()
-        if category:
-            db_product.categories.append(category)
-
-    for tag_id in tag_ids:
-        tag = db.query(Tag).filter(Tag.id == tag_id).first()
-        if tag:
-            db_product.tags.append(tag)
-
     db.add(db_product)
+    db.flush()
+
+    sync_association(db, product.product_categories, "product_id", db_product.id,
+                     "category_id", category_ids, current_ids=set())
+    sync_association(db, product.product_tags, "product_id", db_product.id,
+                     "tag_id", tag_ids, current_ids=set())
     db.commit()
+    catalog_cache.clear()
     db.refresh(db_product)
     return db_product
 
@@ -52,29 +245,35 @@ def create_product(db: Session,
 def update_product(db: Session,
                    db_product: product.Product,
                    product_in: schemas.ProductUpdate) -> product.Product:
-    """Update an existing product."""
+    """Update an existing product.
+
+    Raises ``ValueError`` if any category or tag id does not exist.
+    """
     update_data = product_in.model_dump(exclude_unset=True)
+    category_ids = update_data.pop("category_ids", None)
+    tag_ids = update_data.pop("tag_ids", None)
+
+    # Validate both id lists before touching any association rows
+    if category_ids is not None:
+        category_ids = resolve_ids(db, Category, category_ids, "category")
+    if tag_ids is not None:
+        tag_ids = resolve_ids(db, Tag, tag_ids, "tag")
 
-    if "category_ids" in update_data:
-        new_category_ids = update_data.pop("category_ids")
-        db_product.categories = []  # Clear existing categories
-        for category_id in new_category_ids:
-            category = db.query(Category).filter(Category.id == category_id).first()
-            if category:
-                db_product.categories.append(category)
-
-    if "tag_ids" in update_data:
-        new_tag_ids = update_data.pop("tag_ids")
-        db_product.tags = []  # Clear existing tags
-        for tag_id in new_tag_ids:
-            tag = db.query(Tag).filter(Tag.id == tag_id).first()
-            if tag:
-                db_product.tags.append(tag)
+    if category_ids is not None:
+        sync_association(db, product.product_categories, "product_id", db_product.id,
+                         "category_id", category_ids)
+    if tag_ids is not None:
+        sync_association(db, product.product_tags, "product_id", db_product.id,
+                         "tag_id", tag_ids)
+    if category_ids is not None or tag_ids is not None:
+        # Association rows live in other tables; bump the row so its validators change too
+        db_product.updated_at = func.now()
 
     for field, value in update_data.items():
         setattr(db_product, field, value)
 
     db.add(db_product)
     db.commit()
+    catalog_cache.clear()
     db.refresh(db_product)
     return db_product
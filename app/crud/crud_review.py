@@ -1,30 +1,120 @@
+from sqlalchemy import Float, case, cast, delete, func, select, update
 from sqlalchemy.orm import Session
 
+from app.crud.crud_pagination import Page, paginate
+from app.models.product import Product
 from app.models.review import Review
 from app.schemas.review import ReviewCreate, ReviewUpdate
 
+# Histogram column per star rating
+RATING_COLUMNS = {stars: getattr(Product, f"rating_{stars}") for stars in range(1, 6)}
+RECOMPUTE_BATCH_SIZE = 1000
 
-def get_reviews(db: Session, review_id: int) -> Review | None:
+
+def get_review(db: Session, review_id: int) -> Review | None:
     return db.query(Review).filter(Review.id == review_id).first()
 
-def get_reviews_by_product(db: Session, product_id: int, skip: int = 0, limit: int = 100) -> list[Review]:
-    return db.query(Review).filter(Review.product_id == product_id).offset(skip).limit(limit).all()
+def get_reviews_by_product(db: Session, product_id: int, skip: int = 0, limit: int = 100,
+                           cursor: str | None = None) -> Page:
+    return paginate(db, select(Review).filter(Review.product_id == product_id), Review, (), skip, cursor, limit)
+
+def _adjust_rating_aggregates(db: Session, product_id: int, rating: int | None, delta: int) -> None:
+    """Add (``delta=1``) or remove (``delta=-1``) one rating from a product's aggregates.
+
+    A single UPDATE computed from the row's current values, so concurrent review writes never
+    lose each other's increments. Runs in the caller's transaction and commits with the review.
+    """
+    if rating is None:
+        return
+    count = Product.rating_count + delta
+    total = Product.rating_sum + delta * rating
+    db.execute(
+        update(Product)
+        .where(Product.id == product_id)
+        .values({
+            Product.rating_count: count,
+            Product.rating_sum: total,
+            RATING_COLUMNS[rating]: RATING_COLUMNS[rating] + delta,
+            Product.rating_avg: case((count > 0, cast(total, Float) / count), else_=0.0),
+        })
+        .execution_options(synchronize_session=False)
+    )
 
 def create_review(db: Session, review: ReviewCreate) -> Review:
     db_review = Review(**review.model_dump())
     db.add(db_review)
+    _adjust_rating_aggregates(db, db_review.product_id, db_review.rating, 1)
     db.commit()
     db.refresh(db_review)
     return db_review
 
-def update_review(db: Session, review: Review, review_in: ReviewUpdate) -> Review:
+def update_review(db: Session, review: Review, review_in: ReviewUpdate) -> Review | None:
+    """Apply ``review_in`` and move the review's rating between product aggregates; None if it is gone."""
+    # Re-read the row under a lock: the values loaded earlier may predate a concurrent edit,
+    # and the aggregate delta must be computed from what is stored
+    current = db.scalars(
+        select(Review).where(Review.id == review.id).with_for_update()
+        .execution_options(populate_existing=True)
+    ).first()
+    if current is None:
+        return None
+    previous = (review.product_id, review.rating)
     for field, value in review_in.model_dump(exclude_unset=True).items():
         setattr(review, field, value)
+    if (review.product_id, review.rating) != previous:
+        _adjust_rating_aggregates(db, previous[0], previous[1], -1)
+        _adjust_rating_aggregates(db, review.product_id, review.rating, 1)
     db.add(review)
     db.commit()
     db.refresh(review)
     return review
 
-def delete_review(db: Session, review: Review):
-    db.delete(review)
+def delete_review(db: Session, review: Review) -> bool:
+    """Delete a review and remove its rating from the aggregates; False if it was already gone."""
+    deleted = db.execute(
+        delete(Review).where(Review.id == review.id).returning(Review.product_id, Review.rating)
+    ).first()
+    # Only the transaction whose DELETE removed the row adjusts the aggregates, with the rating it
+    # removed, so concurrent deletes of one review cannot both decrement them
+    if deleted is not None:
+        _adjust_rating_aggregates(db, deleted.product_id, deleted.rating, -1)
+    db.commit()
+    return deleted is not None
+
+def recompute_rating_aggregates(db: Session) -> int:
+    """Rebuild every product's rating aggregates from the reviews table; returns products with reviews.
+
+    For backfills and repairs: all aggregates are reset, then the per-product totals from one
+    grouped scan of ``reviews`` are written back in batches, in a single transaction.
+    """
+    db.execute(update(Product).values({
+        Product.rating_avg: 0.0, Product.rating_count: 0, Product.rating_sum: 0,
+        **{column: 0 for column in RATING_COLUMNS.values()},
+    }).execution_options(synchronize_session=False))
+
+    totals = db.execute(
+        select(
+            Review.product_id,
+            func.count(Review.rating),
+            func.coalesce(func.sum(Review.rating), 0),
+            *[func.count(case((Review.rating == stars, 1))) for stars in RATING_COLUMNS],
+        )
+        .where(Review.rating.is_not(None))
+        .group_by(Review.product_id)
+    )
+    updated = 0
+    while rows := totals.fetchmany(RECOMPUTE_BATCH_SIZE):
+        # ORM bulk UPDATE by primary key: one executemany per batch
+        db.execute(update(Product), [
+            {
+                "id": product_id,
+                "rating_count": count,
+                "rating_sum": total,
+                "rating_avg": total / count,
+                **{f"rating_{stars}": n for stars, n in zip(RATING_COLUMNS, histogram)},
+            }
+            for product_id, count, total, *histogram in rows
+        ])
+        updated += len(rows)
     db.commit()
+    return updated
@@ -1,5 +1,7 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.crud.crud_pagination import Page, paginate
 from app.models.tag import Tag
 from app.schemas.tag import TagCreate, TagUpdate
 
@@ -11,8 +13,8 @@ def get_tag(db: Session, tag_id: int) -> Tag | None:
 def get_tag_by_slug(db: Session, slug: str) -> Tag | None:
     return db.query(Tag).filter(Tag.slug == slug).first()
 
-def get_tags(db: Session, skip: int = 0, limit: int = 100) -> list[Tag]:
-    return db.query(Tag).offset(skip).limit(limit).all()
+def get_tags(db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None) -> Page:
+    return paginate(db, select(Tag), Tag, (), skip, cursor, limit)
 
 def create_tag(db: Session, tag: TagCreate) -> Tag:
     db_tag = Tag(**tag.model_dump())
@@ -1,5 +1,8 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
+from app.crud.crud_pagination import Page, paginate
+from app.models.image_derivative import ImageDerivative
 from app.models.tool import Tool
 from app.schemas.tool import ToolCreate, ToolUpdate
 
@@ -10,8 +13,18 @@ def get_tool(db: Session, tool_id: int) -> Tool | None:
 def get_tool_by_slug(db:Session, slug: str) -> Tool | None:
     return db.query(Tool).filter(Tool.slug == slug).first()
 
-def get_tools(db: Session, skip: int = 0, limit: int = 100) -> list[Tool]:
-    return db.query(Tool).offset(skip).limit(limit).all()
+def get_tool_version(db: Session, slug: str):
+    """(id, updated_at, logo derivative updated_at) of a tool, without loading it; None if missing."""
+    query = (
+        select(Tool.id, Tool.updated_at, ImageDerivative.updated_at)
+        .outerjoin(ImageDerivative, ImageDerivative.source_url == Tool.logo_url)
+        .filter(Tool.slug == slug)
+    )
+    return db.execute(query).first()
+
+def get_tools(db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None) -> Page:
+    query = select(Tool).options(selectinload(Tool.logo_derivative))
+    return paginate(db, query, Tool, (Tool.created_at,), skip, cursor, limit)
 
 def create_tool(db: Session, tool: ToolCreate) -> Tool:
     db_tool = Tool(**tool.model_dump())
@@ -1,6 +1,10 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core import security
+from app.core.exceptions import PasswordHasherBusyError
+from app.crud.crud_pagination import Page, paginate
 from app.models import user as models
 from app.schemas import user as schemas
 
@@ -13,13 +17,24 @@ def get_user_by_email(db: Session, email: str):
     """Retrieve a user by their email address."""
     return db.query(models.User).filter(models.User.email == email).first()
 
+async def get_user_by_email_async(db: AsyncSession, email: str):
+    """Retrieve a user by their email address without blocking the event loop."""
+    return (await db.scalars(select(models.User).filter(models.User.email == email))).first()
+
+async def set_refresh_token_async(db: AsyncSession, user_id: int, refresh_token: str | None):
+    """Store (or clear) a user's refresh token with a single UPDATE."""
+    await db.execute(
+        update(models.User).where(models.User.id == user_id).values(refresh_token=refresh_token)
+    )
+    await db.commit()
+
 def get_user_by_email_with_password(db: Session, email: str):
     """Retrieve a user by their email address, including hashed password."""
     return db.query(models.User).filter(models.User.email == email).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
+def get_users(db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None) -> Page:
     """Retrieve all users."""
-    return db.query(models.User).offset(skip).limit(limit).all()
+    return paginate(db, select(models.User), models.User, (), skip, cursor, limit)
 
 def create_user(db: Session, user: schemas.UserCreate):
     """Create a new user with validation."""
@@ -43,12 +58,16 @@ def create_user(db: Session, user: schemas.UserCreate):
         db.commit()
         db.refresh(db_user)
         return db_user
+    except PasswordHasherBusyError:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise ValueError(f"Error creatinguser: {str(e)}")
 
 def update_user(db: Session, db_user: models.User, user_in: schemas.UserUpdate):
     """Update an existing user."""
+    previous_email = db_user.email
     user_data = user_in.model_dump(exclude_unset=True)
     if "password" in user_data:
         user_data["hashes_password"] = security.get_password_hash(user_data["password"])
@@ -58,6 +77,7 @@ def update_user(db: Session, db_user: models.User, user_in: schemas.UserUpdate):
         setattr(db_user, field, user_data[field])
     db.add(db_user)
     db.commit()
+    security.principal_cache.invalidate(previous_email, db_user.email)
     db.refresh(db_user)
     return db_user
 
@@ -67,5 +87,6 @@ def delete_user(db: Session, user_id: int):
     if db_user:
         db.delete(db_user)
         db.commit()
+        security.principal_cache.invalidate(db_user.email)
     else:
         raise ValueError("User not found")
\ No newline at end of file
@@ -1,18 +1,16 @@
-import time
-from collections import defaultdict
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError #type: ignore
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
-from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.core.config import settings
-from app.core.database import get_db
-from app.core.exceptions import InvalidCredentialsError
-from app.core.security import verify_token
+from app.core.database import get_async_db, get_db
+from app.core.exceptions import InvalidCredentialsError, TokenExpiredError
+from app.core.rate_limit import RateLimiter
+from app.core.security import principal_cache, verify_token
 from app.crud import crud_user as crud
 from app.models import user as models_user
 from app.schemas import user as schemas_user
@@ -23,26 +21,18 @@ reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/tok
 #rate limiting configuration
 RATE_LIMIT = 5 # max requests
 TIME_WINDOW = 60 # Time window in seconds
-request_counts: defaultdict[str, list[float]] = defaultdict(list)
 
-async def rate_limiter(request: Request) -> None:
-    """Rate limiting dependency to prevent abouse."""
-    client_ip = request.client.host if request.client else "unknown"
-    current_time = time.time()
-    request_times = request_counts[client_ip]
+# Rate limiting dependency for the login endpoint, keyed by client IP
+rate_limiter = RateLimiter(limit=RATE_LIMIT, window=TIME_WINDOW, scope="auth-token")
 
-    #Remove outdated requests
-    request_counts[client_ip] = [t for t in request_times if current_time - t < TIME_WINDOW]
-
-    if len(request_counts[client_ip]) >= RATE_LIMIT:
-        raise HTTPException(status_code=HTTP_429_TOO_MANY_REQUESTS, detail="Too many requests. Please try again later.")
-    request_counts[client_ip].append(current_time)
-
-async def get_current_user(
+def get_current_user(
         token: Annotated[str, Depends(reusable_oauth2)],
         db: Session = Depends(get_db),
 ) -> models_user.User:
-    """Retrive the current user from the JWT token."""
+    """Retrive the current user from the JWT token.
+
+    Declared sync so the user lookup runs on the threadpool instead of the event loop.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -53,12 +43,21 @@ async def get_current_user(
         token_data = schemas_user.TokenData(email= payload.get("sub"))
         if not token_data.email:
             raise credentials_exception
-    except (JWTError, ValidationError, InvalidCredentialsError, KeyError):
+    except (JWTError, ValidationError, InvalidCredentialsError, TokenExpiredError, KeyError):
         raise credentials_exception
+    cached = principal_cache.get(token_data.email)
+    if cached is not None:
+        # Attach the snapshot to this request's session without a SELECT;
+        # columns that are not cached load on first access.
+        user = models_user.User(**cached)
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
     user = crud.get_user_by_email(db, email=token_data.email)
     if user is None:
         raise credentials_exception
-    print(f"User {user.email} is_superuser: {user.is_superuser} ")
+    principal_cache.set(token_data.email, user)
     return user
 
 async def get_current_active_user(
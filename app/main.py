@@ -1,14 +1,14 @@
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.endpoints import (
     articles,
@@ -27,23 +27,60 @@ from app.api.v1.endpoints import (
 from app.core.config import settings
 from app.core.exceptions import (
     InvalidCredentialsError,
+    InvalidCursorError,
+    PasswordHasherBusyError,
     PermissionDeniedError,
     TokenExpiredError,
+    UploadTooLargeError,
     UserAlreadyExistsError,
 )
-from app.core.middleware import RequestLoggingMiddleware
+from app.core.image_pipeline import image_pipeline
+from app.core.ip_filter import verify_admin_ip
+from app.core.metrics import render_metrics
+from app.core.middleware import (
+    BodySizeLimitMiddleware,
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    RequestContextMiddleware,
+)
+from app.core.static_files import UploadStaticFiles
 
 logger = logging.getLogger(__name__)
 
 # Configure logging for production
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await image_pipeline.shutdown()
+
 app = FastAPI(
     title="Backend API Learning",
+    lifespan=lifespan,
     docs_url='/docs',
     redoc_url='/redoc',
 )
 
+app.add_middleware(RequestContextMiddleware, sample_rate=settings.REQUEST_LOG_SAMPLE_RATE)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware, debug=settings.DEBUG)
+# Multipart framing adds a little on top of the file itself; save_upload enforces the exact limit
+app.add_middleware(BodySizeLimitMiddleware, max_body_size=settings.MAX_UPLOAD_SIZE + 64 * 1024,
+                   path_prefix=f"{settings.API_V1_STR}/uploads")
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"detail": exc.detail})
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": exc.detail}, headers={"Retry-After": "1"})
+
+@app.exception_handler(UploadTooLargeError)
+async def upload_too_large_handler(request: Request, exc: UploadTooLargeError) -> JSONResponse:
+    return JSONResponse(status_code=413, content={"detail": exc.detail})
+
 app.include_router(users.router,
                    prefix=f"{settings.API_V1_STR}/users",
                    tags=["users"])
@@ -81,11 +118,19 @@ app.include_router(uploads.router,
                    prefix=f"{settings.API_V1_STR}/uploads",
                    tags=["uploads"])
 
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_admin_ip)])
+def metrics() -> Response:
+    """Prometheus scrape endpoint; restricted to ADMIN_ALLOWED_IPS when that is set."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
 # Serve uploaded files
 upload_path = Path(settings.UPLOAD_DIR)
 upload_path.mkdir(parents=True, exist_ok=True)
 upload_path.chmod(0o755)
-app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
+app.mount("/uploads",
+          UploadStaticFiles(directory=settings.UPLOAD_DIR, accel_redirect_prefix=settings.UPLOAD_ACCEL_REDIRECT_PREFIX),
+          name="uploads")
 
 
 
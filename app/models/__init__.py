@@ -0,0 +1,7 @@
+# Import every model module so the mapper registry is complete whenever any model is used;
+# string relationship targets ("User") must resolve before module-level loader options are built.
+import importlib
+import pkgutil
+
+for _module in pkgutil.iter_modules(__path__):
+    importlib.import_module(f"{__name__}.{_module.name}")
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, Table
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import DDL, Column, DateTime, ForeignKey, Index, Integer, String, Text, Table, event
+from sqlalchemy.orm import foreign, relationship, remote
+from sqlalchemy.sql import column, func, table
 
 from app.core.database import Base
+from app.models.image_derivative import ImageDerivative
 
 
 # Association table for articles and categories
@@ -11,6 +12,8 @@ article_categories = Table(
     Base.metadata,
     Column("article_id", Integer, ForeignKey("articles.id"), primary_key=True),
     Column("category_id", Integer, ForeignKey("categories.id"), primary_key=True),
+    # The primary key serves article -> categories; this serves the category filter
+    Index("ix_article_categories_category_id_article_id", "category_id", "article_id"),
     extend_existing=True
 )
 
@@ -27,7 +30,15 @@ class Article(Base):
     """Blog or tutorial article."""
 
     __tablename__ = "articles"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_articles_created_at_id", "created_at", "id"),
+        # List filters and the published_at ordering; id breaks ties for keyset pages
+        Index("ix_articles_status_published_at", "status", "published_at", "id"),
+        Index("ix_articles_status_created_at", "status", "created_at", "id"),
+        Index("ix_articles_type_status_published_at", "type", "status", "published_at", "id"),
+        Index("ix_articles_type_status_created_at", "type", "status", "created_at", "id"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     type = Column(String(20), nullable=False)
@@ -45,3 +56,63 @@ class Article(Base):
     author = relationship("User", backref="articles")
     categories = relationship("Category", secondary=article_categories, backref="articles")
     tags = relationship("Tag", secondary=article_tags, backref="articles")
+    featured_image_derivative = relationship(
+        ImageDerivative,
+        primaryjoin=lambda: foreign(Article.featured_image_url) == remote(ImageDerivative.source_url),
+        viewonly=True,
+        uselist=False,
+    )
+
+    @property
+    def category_ids(self) -> list[int]:
+        return [category.id for category in self.categories]
+
+    @property
+    def tag_ids(self) -> list[int]:
+        return [tag.id for tag in self.tags]
+
+    @property
+    def featured_image_variants(self) -> dict[str, str]:
+        derivative = self.featured_image_derivative
+        return derivative.ready_variants if derivative is not None else {}
+
+
+# Full-text index over title, excerpt and content. SQLite keeps an external-content FTS5 table in
+# sync with triggers; Postgres uses a generated, weighted tsvector column with a GIN index. Both are
+# created with the articles table; every statement is idempotent so app/scripts can apply them to
+# existing databases.
+articles_fts = table("articles_fts", column("rowid"), column("rank"))
+
+SQLITE_SEARCH_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, excerpt, content, content='articles', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2')""",
+    # Title matches count most; makes ORDER BY rank use these weights
+    "INSERT INTO articles_fts(articles_fts, rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0)')",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, excerpt, content) VALUES (new.id, new.title, new.excerpt, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.id, old.title, old.excerpt, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, excerpt, content ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.id, old.title, old.excerpt, old.content);
+        INSERT INTO articles_fts(rowid, title, excerpt, content) VALUES (new.id, new.title, new.excerpt, new.content);
+    END""",
+)
+
+POSTGRES_SEARCH_DDL = (
+    """ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(excerpt, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING GIN (search_vector)",
+)
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Article.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Article.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(Article.__table__, "before_drop", DDL("DROP TABLE IF EXISTS articles_fts").execute_if(dialect="sqlite"))
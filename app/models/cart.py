@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -9,11 +9,24 @@ class Cart(Base):
     """Shopping cart ownd by a user."""
 
     __tablename__ = "carts"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # One cart per user; also the conflict target for concurrent get-or-create
+        Index("ix_carts_user_id", "user_id", unique=True),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", backref="carts")
-    items = relationship("CartItem", back_populates="cart")
\ No newline at end of file
+    items = relationship("CartItem", back_populates="cart")
+
+    @property
+    def item_count(self) -> int:
+        return sum(item.quantity or 0 for item in self.items)
+
+    @property
+    def subtotal(self) -> float:
+        """Sum of line totals; needs ``items`` and their products loaded."""
+        return round(sum(item.line_total for item in self.items), 2)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer
+from sqlalchemy import Column, ForeignKey, Integer, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -8,7 +8,11 @@ class CartItem(Base):
     """Item within a shopping cart."""
 
     __tablename__ = "cart_items"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # A product appears once per cart; adding it again increases the quantity (an upsert target)
+        UniqueConstraint("cart_id", "product_id", name="uq_cart_items_cart_id_product_id"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     cart_id = Column(Integer, ForeignKey('carts.id'), nullable=False)
@@ -16,4 +20,8 @@ class CartItem(Base):
     quantity = Column(Integer)
 
     cart = relationship('Cart', back_populates='items')
-    product = relationship('Product')
\ No newline at end of file
+    product = relationship('Product')
+
+    @property
+    def line_total(self) -> float:
+        return round((self.quantity or 0) * self.product.price, 2)
\ No newline at end of file
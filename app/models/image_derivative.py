@@ -0,0 +1,23 @@
+from sqlalchemy import JSON, Column, DateTime, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class ImageDerivative(Base):
+    """Resized variants generated for an uploaded image, keyed by the original's URL."""
+
+    __tablename__ = "image_derivatives"
+    __table_args__ = {'extend_existing': True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_url = Column(String(255), unique=True, nullable=False, index=True)
+    status = Column(String(20), nullable=False, default="pending")  # pending, ready or failed
+    variants = Column(JSON, nullable=False, default=dict)  # variant name -> URL
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    @property
+    def ready_variants(self) -> dict[str, str]:
+        return dict(self.variants or {}) if self.status == "ready" else {}
@@ -1,8 +1,9 @@
-from sqlalchemy import JSON, Boolean, Column, Date, DateTime, Float, Integer, String, Text, Table, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import JSON, Boolean, Column, Date, DateTime, Float, Index, Integer, String, Text, Table, ForeignKey
+from sqlalchemy.orm import foreign, relationship, remote
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.models.image_derivative import ImageDerivative
 
 # Association table for products and categories
 product_categories = Table(
@@ -10,6 +11,8 @@ product_categories = Table(
     Base.metadata,
     Column("product_id", Integer, ForeignKey("products.id"), primary_key=True),
     Column("category_id", Integer, ForeignKey("categories.id"), primary_key=True),
+    # The primary key serves product -> categories; this serves category -> products (filters, facets)
+    Index("ix_product_categories_category_id_product_id", "category_id", "product_id"),
     extend_existing=True
 )
 
@@ -19,6 +22,7 @@ product_tags = Table(
     Base.metadata,
     Column("product_id", Integer, ForeignKey("products.id"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    Index("ix_product_tags_tag_id_product_id", "tag_id", "product_id"),
     extend_existing=True
 )
 
@@ -26,7 +30,12 @@ class Product(Base):
     """Model representing eBook products."""
 
     __tablename__ = "products"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_products_created_at_id", "created_at", "id"),
+        # Covers every scalar catalog filter and facet, so facet counts are index-only scans
+        Index("ix_products_catalog", "status", "language", "format", "is_featured", "price"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -36,6 +45,15 @@ class Product(Base):
     price = Column(Float, nullable=False, default=0.0)
     author_name = Column(String(100))
     rating = Column(Float, default=0.0)
+    # Review aggregates, kept current by crud_review in the same transaction as each review write
+    rating_avg = Column(Float, nullable=False, default=0.0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5 = Column(Integer, nullable=False, default=0, server_default="0")
     language = Column(String(10), nullable=False)
     publication_date = Column(Date)
     pages = Column(Integer)
@@ -49,5 +67,29 @@ class Product(Base):
 
     categories = relationship("Category", secondary=product_categories, backref="products")
     tags = relationship("Tag", secondary=product_tags, backref= "products")
+    cover_image_derivative = relationship(
+        ImageDerivative,
+        primaryjoin=lambda: foreign(Product.cover_image_url) == remote(ImageDerivative.source_url),
+        viewonly=True,
+        uselist=False,
+    )
+
+    @property
+    def category_ids(self) -> list[int]:
+        return [category.id for category in self.categories]
+
+    @property
+    def tag_ids(self) -> list[int]:
+        return [tag.id for tag in self.tags]
+
+    @property
+    def rating_histogram(self) -> dict[int, int]:
+        """Number of reviews per star rating, 1 to 5."""
+        return {stars: getattr(self, f"rating_{stars}") for stars in range(1, 6)}
+
+    @property
+    def cover_image_variants(self) -> dict[str, str]:
+        derivative = self.cover_image_derivative
+        return derivative.ready_variants if derivative is not None else {}
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -9,7 +9,12 @@ class Review(Base):
     """Product review by a user."""
 
     __tablename__ = 'reviews'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_reviews_product_id_id", "product_id", "id"),
+        # Product rating aggregates keep one counter per star
+        CheckConstraint("rating BETWEEN 1 AND 5", name="ck_reviews_rating_range"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey('products.id'), nullable=False)
@@ -1,14 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime
+from sqlalchemy.orm import foreign, relationship, remote
 from sqlalchemy.sql import func
 
 from app.core.database import Base
+from app.models.image_derivative import ImageDerivative
 
 
 class Tool(Base):
     """Model representing AI tools."""
 
     __tablename__ = "tools"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_tools_created_at_id", "created_at", "id"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -18,4 +23,16 @@ class Tool(Base):
     logo_url = Column(String(255))
     pricing_type = Column(String(20))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    logo_derivative = relationship(
+        ImageDerivative,
+        primaryjoin=lambda: foreign(Tool.logo_url) == remote(ImageDerivative.source_url),
+        viewonly=True,
+        uselist=False,
+    )
+
+    @property
+    def logo_variants(self) -> dict[str, str]:
+        derivative = self.logo_derivative
+        return derivative.ready_variants if derivative is not None else {}
@@ -9,7 +9,7 @@ class ArticleBase(BaseModel):
     content: str | None = None
     featured: bool | None = None
     status: str = "draft"
-    tyoe: str # 'blog or 'tutorial'
+    type: str # 'blog or 'tutorial'
     category_ids: list[int] = []
     tag_ids: list[int] = []
 
@@ -32,6 +32,11 @@ class ArticleUpdate(BaseModel):
 
 class Article(ArticleBase):
     id: int
+    featured_image_url: str | None = None
+    # Resized WebP versions of the featured image ("thumb", "medium") once generated
+    featured_image_variants: dict[str, str] = {}
+    # Best-matching passage with hits in <mark>, only on search results
+    snippet: str | None = None
     author_id: int | None = None
     published_at: datetime | None = None
     created_at: datetime
@@ -2,7 +2,7 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
-from app.schemas.cart_item import CartItem
+from app.schemas.cart_item import CartLine
 
 
 class CartBase(BaseModel):
@@ -14,7 +14,9 @@ class CartCreate(CartBase):
 class Cart(CartBase):
     id: int
     created_at: datetime
-    items: list[CartItem] = []
+    items: list[CartLine] = []
+    item_count: int = 0
+    subtotal: float = 0.0
 
     class Config:
         from_attributes = True
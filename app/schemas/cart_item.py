@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 class CartItemBase(BaseModel):
     product_id: int
@@ -6,7 +6,7 @@ class CartItemBase(BaseModel):
 
 
 class CartItemCreate(CartItemBase):
-    pass
+    quantity: int = Field(gt=0)
 
 class CartItemUpdate(BaseModel):
     product_id: int | None = None
@@ -19,5 +19,17 @@ class CartItem(CartItemBase):
     class Config:
         from_attributes = True
 
+class CartProduct(BaseModel):
+    """The product fields a cart line shows."""
 
+    id: int
+    title: str
+    slug: str
+    price: float
+    cover_image_url: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
 
+class CartLine(CartItem):
+    product: CartProduct
+    line_total: float
@@ -1,6 +1,23 @@
+from datetime import datetime
+
 from fastapi import FastAPI
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class UploadResponse(BaseModel):
     """Response model for uploaded files"""
-    url: str
\ No newline at end of file
+    url: str
+    size: int
+    sha256: str
+    # Status of the resized variants for image uploads ("pending", "ready" or "failed")
+    image_status: str | None = None
+
+
+class ImageDerivative(BaseModel):
+    """Resized variants generated for an uploaded image"""
+    source_url: str
+    status: str
+    variants: dict[str, str] = {}
+    error: str | None = None
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
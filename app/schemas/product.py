@@ -44,8 +44,37 @@ class ProductUpdate(BaseModel):
 
 class Product(ProductBase):
     id: int
+    # Resized WebP versions of the cover ("thumb", "medium") once generated; prefer them in lists
+    cover_image_variants: dict[str, str] = {}
+    # Maintained from reviews; no aggregate query runs at read time
+    rating_avg: float = 0.0
+    rating_count: int = 0
+    rating_histogram: dict[int, int] = {}
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class ProductSearchFilters(BaseModel):
+    """Catalog filters; ``category`` and ``tag`` are slugs, and a category includes its descendants."""
+
+    min_price: float | None = None
+    max_price: float | None = None
+    language: str | None = None
+    format: str | None = None
+    status: str | None = None
+    is_featured: bool | None = None
+    category: str | None = None
+    tag: str | None = None
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+class ProductSearchResult(BaseModel):
+    items: list[Product]
+    # Products matching every filter
+    total: int
+    # Per dimension, counts with every filter applied except that dimension's own
+    facets: dict[str, list[FacetValue]]
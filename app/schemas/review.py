@@ -1,12 +1,12 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ReviewBase(BaseModel):
     product_id: int
     user_id: int
-    rating: int
+    rating: int = Field(ge=1, le=5)
     comment: str | None = None
 
 class ReviewCreate(ReviewBase):
@@ -15,7 +15,7 @@ class ReviewCreate(ReviewBase):
 class ReviewUpdate(BaseModel):
     product_id : int | None = None
     user_id: int | None = None
-    rating: int | None = None
+    rating: int | None = Field(None, ge=1, le=5)
     comment: str | None = None
 
 class Review(ReviewBase):
@@ -22,5 +22,7 @@ class ToolUpdate(BaseModel):
 
 class Tool(ToolBase):
     id: int
+    # Resized WebP versions of the logo ("thumb", "medium") once generated
+    logo_variants: dict[str, str] = {}
 
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
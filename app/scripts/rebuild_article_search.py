@@ -0,0 +1,36 @@
+"""Create the article full-text index on an existing database and (re)build it from the articles table.
+
+New databases get the index when the articles table is created; run this once for databases that
+predate it, or after bulk-loading articles with the triggers bypassed:
+
+    python -m app.scripts.rebuild_article_search
+"""
+import logging
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.models.article import POSTGRES_SEARCH_DDL, SQLITE_SEARCH_DDL
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_article_search() -> None:
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            for statement in SQLITE_SEARCH_DDL:
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+        elif dialect == "postgresql":
+            # The generated column is computed for every existing row when it is added
+            for statement in POSTGRES_SEARCH_DDL:
+                conn.execute(text(statement))
+        else:
+            raise RuntimeError(f"Article search is not supported on {dialect}")
+    logger.info("Article search index rebuilt (%s)", dialect)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    rebuild_article_search()
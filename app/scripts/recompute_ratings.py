@@ -0,0 +1,44 @@
+"""Backfill or repair product rating aggregates from the reviews table.
+
+Adds the aggregate columns to a products table that predates them, then recomputes every
+product's average, count and star histogram in one pass over the reviews:
+
+    python -m app.scripts.recompute_ratings
+"""
+import logging
+
+from sqlalchemy import inspect, text
+
+from app.core.database import SessionLocal, engine
+from app.crud.crud_review import RATING_COLUMNS, recompute_rating_aggregates
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+AGGREGATE_COLUMNS = (Product.rating_avg, Product.rating_count, Product.rating_sum, *RATING_COLUMNS.values())
+
+
+def add_missing_columns() -> None:
+    existing = {column["name"] for column in inspect(engine).get_columns(Product.__tablename__)}
+    with engine.begin() as conn:
+        for attribute in AGGREGATE_COLUMNS:
+            column = attribute.property.columns[0]
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            conn.execute(text(
+                f"ALTER TABLE {Product.__tablename__} ADD COLUMN {column.name} {column_type} NOT NULL DEFAULT 0"
+            ))
+            logger.info("Added products.%s", column.name)
+
+
+def recompute_ratings() -> None:
+    add_missing_columns()
+    with SessionLocal() as db:
+        updated = recompute_rating_aggregates(db)
+    logger.info("Rating aggregates recomputed; %d products have reviews", updated)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    recompute_ratings()
@@ -0,0 +1,41 @@
+"""Prepare an existing database for the filtered, published_at-ordered article list.
+
+Creates the listing indexes that ``create_all`` only adds with new tables, and gives published
+articles that predate automatic ``published_at`` stamping their creation time:
+
+    python -m app.scripts.upgrade_article_listing
+"""
+import logging
+
+from sqlalchemy import update
+
+from app.core.database import engine
+from app.models.article import Article, article_categories
+
+logger = logging.getLogger(__name__)
+
+LISTING_INDEXES = (
+    "ix_articles_status_published_at",
+    "ix_articles_status_created_at",
+    "ix_articles_type_status_published_at",
+    "ix_articles_type_status_created_at",
+    "ix_article_categories_category_id_article_id",
+)
+
+
+def upgrade_article_listing() -> None:
+    indexes = {index.name: index for index in (*Article.__table__.indexes, *article_categories.indexes)}
+    with engine.begin() as conn:
+        for name in LISTING_INDEXES:
+            indexes[name].create(conn, checkfirst=True)
+        backfilled = conn.execute(
+            update(Article)
+            .where(Article.status == "published", Article.published_at.is_(None))
+            .values(published_at=Article.created_at)
+        ).rowcount
+    logger.info("Article listing indexes in place; published_at backfilled for %d articles", backfilled)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    upgrade_article_listing()
@@ -0,0 +1,78 @@
+"""Measure per-request overhead of RequestContextMiddleware against a bare ASGI app.
+
+Drives the ASGI callables directly (no server or network), so the numbers isolate middleware cost.
+
+    python -m benchmarks.middleware_overhead [requests]
+"""
+import asyncio
+import logging
+import sys
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.middleware import RequestContextMiddleware
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/bench",
+    "raw_path": b"/bench",
+    "query_string": b"",
+    "root_path": "",
+    "headers": [(b"host", b"testserver")],
+    "client": ("127.0.0.1", 12345),
+    "server": ("testserver", 80),
+}
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def run(app, requests: int) -> float:
+    """Return mean nanoseconds per request."""
+    for _ in range(min(1000, requests)):
+        await app(dict(SCOPE), receive, send)
+    start = time.perf_counter_ns()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter_ns() - start) / requests
+
+
+async def main(requests: int) -> None:
+    # Keep log formatting/IO out of the measurement unless a case opts into it
+    logging.getLogger("app.core.middleware").addHandler(logging.NullHandler())
+    logging.getLogger("app.core.middleware").propagate = False
+    logging.getLogger("app.core.middleware").setLevel(logging.INFO)
+
+    async def passthrough(request, call_next):
+        return await call_next(request)
+
+    cases = {
+        "no middleware": bare_app,
+        "RequestContextMiddleware (sample 0.0)": RequestContextMiddleware(bare_app, sample_rate=0.0),
+        "RequestContextMiddleware (sample 1.0)": RequestContextMiddleware(bare_app, sample_rate=1.0),
+        "BaseHTTPMiddleware passthrough": BaseHTTPMiddleware(bare_app, dispatch=passthrough),
+    }
+    baseline = None
+    for name, app in cases.items():
+        mean_ns = await run(app, requests)
+        baseline = mean_ns if baseline is None else baseline
+        print(f"{name:<40} {mean_ns / 1000:8.2f} us/request  (+{(mean_ns - baseline) / 1000:.2f} us)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -0,0 +1,30 @@
+"""Gunicorn settings for running the app with uvicorn workers.
+
+    PROMETHEUS_MULTIPROC_DIR=/tmp/prometheus gunicorn app.main:app -c gunicorn.conf.py
+
+prometheus_client reads PROMETHEUS_MULTIPROC_DIR when it is imported, so it must be set in the
+environment gunicorn starts with, not in .env.
+"""
+import multiprocessing
+import os
+import shutil
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def on_starting(server):
+    # Samples left over from a previous run would otherwise be merged into the new one
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauge files so in-flight counts do not include it
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,66 @@
+import os
+import tempfile
+
+# Settings are read at import time, so point the app at a throwaway database before importing it
+_TEMP_DIR = tempfile.mkdtemp(prefix="app-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TEMP_DIR}/test.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_TEMP_DIR, "uploads")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.cache import catalog_cache, cms_cache
+from app.core.database import Base, SessionLocal, engine
+from app.core.kv_store import kv_store
+from app.core.security import get_password_hash
+from app.main import app
+from app.models.user import User
+
+PASSWORD = "Secret1!"
+
+
+@pytest.fixture(autouse=True)
+def schema():
+    """A fresh, empty schema for every test."""
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture(autouse=True)
+def shared_state():
+    """Forget cached entries, rate-limit counters and revocations left behind by earlier tests."""
+    yield
+    cms_cache.clear()
+    catalog_cache.clear()
+    # The test settings use the in-process backend; every namespaced view shares its data
+    kv_store._data.clear()
+    kv_store._expiries.clear()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def login(client, db):
+    """Create a user with the given columns and return (user, bearer headers) after a real login."""
+    def login_as(email: str = "shopper@example.com", **fields) -> tuple[User, dict[str, str]]:
+        user = User(email=email, hashed_password=get_password_hash(PASSWORD), is_active=True, **fields)
+        db.add(user)
+        db.commit()
+        response = client.post("/api/v1/auth/token", data={"username": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        return user, {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return login_as
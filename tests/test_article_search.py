@@ -0,0 +1,68 @@
+from app.crud.crud_article import fts5_query, tsquery_prefix
+from app.models.article import Article
+
+
+def test_search_queries_quote_every_word_and_prefix_the_last():
+    text = "fast' | !api's:*"
+
+    assert fts5_query(text) == '"fast" "api" "s"*'
+    assert tsquery_prefix(text) == "'fast' & 'api' & 's':*"
+
+
+def test_search_queries_without_words():
+    assert fts5_query(" -- ") is None
+    assert tsquery_prefix(" -- ") is None
+
+
+
+def add_article(db, slug: str, title: str, content: str = "", excerpt: str | None = None) -> Article:
+    article = Article(type="blog", title=title, slug=slug, content=content, excerpt=excerpt, status="published")
+    db.add(article)
+    db.commit()
+    return article
+
+
+def search(client, text: str) -> list[dict]:
+    response = client.get("/api/v1/articles/", params={"search": text})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_title_matches_rank_above_content_matches(client, db):
+    add_article(db, "body", "Release notes", content="We rewrote the scheduler in rust last spring.")
+    add_article(db, "title", "Rust scheduler", content="A deep dive.")
+
+    assert [article["slug"] for article in search(client, "rust scheduler")] == ["title", "body"]
+
+
+def test_last_word_matches_as_a_prefix(client, db):
+    add_article(db, "python", "Python packaging")
+
+    assert [article["slug"] for article in search(client, "pack")] == ["python"]
+    assert search(client, "python pack")[0]["slug"] == "python"
+    assert search(client, "pack python") == []
+
+
+def test_snippets_escape_html_and_mark_matches(client, db):
+    add_article(db, "xss", "Escaping", content="Never render <script>alert(1)</script> from a markdown file.")
+
+    snippet = search(client, "markdown")[0]["snippet"]
+
+    assert "&lt;script&gt;" in snippet
+    assert "<script>" not in snippet
+    assert "<mark>markdown</mark>" in snippet
+
+
+def test_index_follows_inserts_updates_and_deletes(client, db):
+    article = add_article(db, "tracked", "Caching strategies")
+    assert [hit["slug"] for hit in search(client, "caching")] == ["tracked"]
+
+    article.title = "Indexing strategies"
+    db.commit()
+    assert search(client, "caching") == []
+    assert [hit["slug"] for hit in search(client, "indexing")] == ["tracked"]
+
+    db.delete(article)
+    db.commit()
+    assert search(client, "indexing") == []
+    assert search(client, "strategies") == []
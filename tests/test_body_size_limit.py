@@ -0,0 +1,77 @@
+import pytest
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.middleware import BodySizeLimitMiddleware
+
+LIMIT = 1024
+
+
+@pytest.fixture
+def limited():
+    app = FastAPI()
+    app.add_middleware(BodySizeLimitMiddleware, max_body_size=LIMIT, path_prefix="/upload")
+    seen = []
+
+    @app.post("/upload/raw")
+    async def raw(request: Request):
+        body = await request.body()
+        seen.append(len(body))
+        return {"size": len(body)}
+
+    @app.post("/upload/file")
+    async def upload(file: UploadFile = File(...)):
+        size = len(await file.read())
+        seen.append(size)
+        return {"size": size}
+
+    @app.post("/other")
+    async def other(request: Request):
+        return {"size": len(await request.body())}
+
+    client = TestClient(app)
+    client.seen = seen
+    return client
+
+
+def chunks(data: bytes, size: int = 256):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def multipart(payload: bytes) -> tuple[bytes, str]:
+    boundary = "limit-test"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.bin\"\r\n"
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def test_oversized_content_length_is_refused_before_the_body_is_read(limited):
+    response = limited.post("/upload/raw", content=b"x" * (LIMIT + 1))
+
+    assert response.status_code == 413
+    assert str(LIMIT) in response.json()["detail"]
+    assert limited.seen == []
+
+
+def test_oversized_chunked_body_is_cut_off(limited):
+    response = limited.post("/upload/raw", content=chunks(b"x" * (LIMIT * 4)))
+
+    assert response.status_code == 413
+    assert limited.seen == []
+
+
+def test_oversized_chunked_upload_is_cut_off_while_parsing_the_form(limited):
+    body, content_type = multipart(b"x" * (LIMIT * 4))
+
+    response = limited.post("/upload/file", content=chunks(body), headers={"Content-Type": content_type})
+
+    assert response.status_code == 413
+    assert limited.seen == []
+
+
+def test_bodies_within_the_limit_and_other_paths_pass(limited):
+    assert limited.post("/upload/raw", content=chunks(b"x" * LIMIT)).json() == {"size": LIMIT}
+    assert limited.post("/other", content=b"x" * (LIMIT * 2)).json() == {"size": LIMIT * 2}
@@ -0,0 +1,46 @@
+import pytest
+
+from app.models.product import Product
+
+
+@pytest.fixture
+def auth_headers(login):
+    return login()[1]
+
+
+@pytest.fixture
+def product_ids(db):
+    products = [Product(title=f"Book {i}", slug=f"book-{i}", language="en", price=10.0) for i in range(2)]
+    db.add_all(products)
+    db.commit()
+    return [product.id for product in products]
+
+
+def add_item(client, headers, product_id: int, quantity: int = 1):
+    return client.post("/api/v1/carts/items", json={"product_id": product_id, "quantity": quantity}, headers=headers)
+
+
+def test_moving_a_line_onto_a_product_already_in_the_cart_conflicts(client, auth_headers, product_ids):
+    first = add_item(client, auth_headers, product_ids[0]).json()
+    add_item(client, auth_headers, product_ids[1])
+
+    response = client.put(f"/api/v1/carts/items/{first['id']}", json={"product_id": product_ids[1], "quantity": 2},
+                          headers=auth_headers)
+
+    assert response.status_code == 409
+    cart = client.get("/api/v1/carts/me", headers=auth_headers).json()
+    assert sorted(item["product_id"] for item in cart["items"]) == product_ids
+
+
+def test_adding_a_product_creates_its_line_then_increases_it(client, auth_headers, product_ids):
+    created = add_item(client, auth_headers, product_ids[0], 2)
+    increased = add_item(client, auth_headers, product_ids[0], 3)
+
+    assert created.status_code == 201
+    assert increased.status_code == 200
+    assert increased.json()["id"] == created.json()["id"]
+    assert increased.json()["quantity"] == 5
+
+
+def test_adding_an_unknown_product_is_not_found(client, auth_headers, product_ids):
+    assert add_item(client, auth_headers, max(product_ids) + 1).status_code == 404
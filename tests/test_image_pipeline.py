@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from app.core.database import async_engine
+from app.core.image_pipeline import ImagePipeline
+from app.core.storage import StoredFile
+
+STORED = StoredFile(key="ab/cd.png", url="/uploads/ab/cd.png", size=1, sha256="abcd", created=True)
+
+
+def run(coroutine):
+    """Run on a fresh event loop, closing the pooled async connections that are bound to it."""
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await async_engine.dispose()
+    return asyncio.run(main())
+
+
+def test_concurrent_submits_of_one_image_schedule_it_once():
+    pipeline = ImagePipeline(max_workers=1, max_queue=1)
+    processed = []
+
+    async def process(stored):
+        processed.append(stored.url)
+
+    pipeline._process = process
+
+    async def submit_twice():
+        statuses = await asyncio.gather(pipeline.submit(STORED), pipeline.submit(STORED))
+        await asyncio.sleep(0)
+        return statuses
+
+    assert run(submit_twice()) == ["pending", "pending"]
+    assert processed == [STORED.url]
+    assert pipeline._in_flight == {}
+
+
+def test_failed_submit_releases_its_slot():
+    pipeline = ImagePipeline(max_workers=1, max_queue=0)
+
+    async def record_submission(stored):
+        raise RuntimeError("database unavailable")
+
+    pipeline._record_submission = record_submission
+
+    with pytest.raises(RuntimeError):
+        run(pipeline.submit(STORED))
+    assert pipeline._in_flight == {}
@@ -0,0 +1,116 @@
+import os
+
+import pytest
+from starlette.requests import Request
+
+from app.core import ip_filter
+from app.core.ip_filter import IPFilter, IPRangeSet, client_ip, parse_address, parse_network
+
+
+def ranges(*entries: str) -> IPRangeSet:
+    return IPRangeSet(parse_network(entry) for entry in entries)
+
+
+def test_ranges_match_inclusive_bounds_and_merge_neighbours():
+    rules = ranges("10.0.0.0/24", "10.0.1.0/24", "192.168.1.10", "2001:db8::/32")
+
+    assert len(rules) == 3
+    for ip in ("10.0.0.0", "10.0.1.255", "192.168.1.10", "2001:db8::1", "::ffff:10.0.0.7"):
+        assert parse_address(ip) in rules
+    for ip in ("9.255.255.255", "10.0.2.0", "192.168.1.11", "2001:db9::1"):
+        assert parse_address(ip) not in rules
+
+
+def test_deny_wins_and_empty_rules_allow_everyone():
+    assert IPFilter().is_allowed("203.0.113.9")
+
+    rules = IPFilter(["10.0.0.0/8"], ["10.1.0.0/16"])
+
+    assert rules.is_allowed("10.2.3.4")
+    assert not rules.is_allowed("10.1.2.3")
+    assert not rules.is_allowed("203.0.113.9")
+    assert not rules.is_allowed("not-an-ip")
+
+
+def test_invalid_entries_are_rejected_and_keep_the_old_rules():
+    rules = IPFilter(["10.0.0.0/8"])
+
+    with pytest.raises(ValueError):
+        rules.reload(["10.0.0.0/8", "10.0.0.300"], [])
+    assert rules.is_allowed("10.0.0.1")
+
+
+def write_rules(path, text: str, tick: int) -> None:
+    path.write_text(text)
+    # Filesystem timestamps can be coarse; make every edit visibly newer
+    os.utime(path, ns=(tick * 10**9, tick * 10**9))
+
+
+def test_allowlist_file_is_reloaded_when_it_changes(tmp_path):
+    path = tmp_path / "admin_ips.txt"
+    write_rules(path, "10.0.0.0/8  # office\n", 1)
+    rules = IPFilter(path=path)
+    rules.RELOAD_INTERVAL = 0
+    assert rules.is_allowed("10.1.1.1")
+    assert not rules.is_allowed("192.168.0.1")
+
+    write_rules(path, "192.168.0.0/16\n!192.168.0.66\n", 2)
+    rules.reload_if_changed()
+    assert rules.is_allowed("192.168.0.1")
+    assert not rules.is_allowed("192.168.0.66")
+    assert not rules.is_allowed("10.1.1.1")
+
+    write_rules(path, "not an address\n", 3)
+    rules.reload_if_changed()
+    assert rules.is_allowed("192.168.0.1")
+
+    path.unlink()
+    rules.reload_if_changed()
+    assert rules.is_allowed("10.1.1.1")
+
+
+def test_reload_waits_for_the_interval(tmp_path):
+    path = tmp_path / "admin_ips.txt"
+    write_rules(path, "10.0.0.0/8\n", 1)
+    rules = IPFilter(path=path)
+
+    write_rules(path, "192.168.0.0/16\n", 2)
+    rules.reload_if_changed()
+
+    assert rules.is_allowed("10.1.1.1")
+
+
+def request_from(peer: str, forwarded_for: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "client": (peer, 50000), "headers": headers})
+
+
+@pytest.fixture
+def trusted_proxy(monkeypatch):
+    monkeypatch.setattr(ip_filter, "trusted_proxies", ranges("10.0.0.0/24"))
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies():
+    assert client_ip(request_from("198.51.100.7", "203.0.113.1")) == "198.51.100.7"
+
+
+def test_forwarded_for_is_ignored_from_an_untrusted_peer(trusted_proxy):
+    assert client_ip(request_from("198.51.100.7", "203.0.113.1")) == "198.51.100.7"
+
+
+def test_trusted_proxy_hops_are_skipped_right_to_left(trusted_proxy):
+    assert client_ip(request_from("10.0.0.1", "203.0.113.1")) == "203.0.113.1"
+    assert client_ip(request_from("10.0.0.1", "203.0.113.1, 10.0.0.2")) == "203.0.113.1"
+
+
+def test_spoofed_forwarded_for_entries_are_not_trusted(trusted_proxy):
+    # The client sent "X-Forwarded-For: 10.0.0.5" itself; the proxy appended the real address
+    assert client_ip(request_from("10.0.0.1", "10.0.0.5, 198.51.100.7")) == "198.51.100.7"
+    assert client_ip(request_from("10.0.0.1", "127.0.0.1, 198.51.100.7")) == "198.51.100.7"
+
+
+def test_garbage_hop_is_returned_and_never_allowed(trusted_proxy):
+    ip = client_ip(request_from("10.0.0.1", "nonsense"))
+
+    assert ip == "nonsense"
+    assert not IPFilter(["0.0.0.0/0"]).is_allowed(ip)
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from app.core.kv_store import MemoryStore, RedisStore
+
+TTL = 0.05
+
+
+def memory_store():
+    return MemoryStore("test")
+
+
+def redis_store():
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisStore("test", client=fakeredis.FakeRedis(decode_responses=True))
+
+
+@pytest.fixture(params=[memory_store, redis_store], ids=["memory", "redis"])
+def store(request):
+    return request.param()
+
+
+def test_get_set_and_delete(store):
+    assert store.get("missing") is None
+    store.set("a", "1")
+    store.set("b", "2")
+
+    assert store.get("a") == "1"
+    assert store.exists("a")
+    store.delete("a", "b", "missing")
+    assert store.get("a") is None
+    assert not store.exists("b")
+
+
+def test_entries_expire_after_their_ttl(store):
+    store.set("short", "1", ttl=TTL)
+    store.set("long", "1")
+    assert store.get("short") == "1"
+
+    time.sleep(TTL * 3)
+
+    assert store.get("short") is None
+    assert store.get("long") == "1"
+
+
+def test_incr_creates_counters_with_a_ttl_kept_by_later_increments(store):
+    assert store.incr("hits", ttl=TTL) == 1
+    assert store.incr("hits", 2, ttl=10) == 3
+
+    time.sleep(TTL * 3)
+
+    assert store.get("hits") is None
+    assert store.incr("hits") == 1
+
+
+def test_get_many_returns_existing_keys_only(store):
+    store.set_many({"a": "1", "b": "2"})
+
+    assert store.get_many(["a", "b", "missing"]) == {"a": "1", "b": "2"}
+    assert store.get_many([]) == {}
+
+
+def test_namespaces_do_not_share_keys(store):
+    other = store.namespaced("other")
+    store.set("key", "outer")
+    other.set("key", "inner")
+
+    assert store.get("key") == "outer"
+    assert other.get("key") == "inner"
+
+
+def test_json_round_trip(store):
+    store.set_json("doc", {"id": 1, "roles": ["admin"]})
+
+    assert store.get_json("doc") == {"id": 1, "roles": ["admin"]}
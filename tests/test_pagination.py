@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.crud import crud_pagination, crud_tool
+from app.models.tool import Tool
+
+WHOLE_SECOND = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def add_tools(db, created_at: list[datetime | None]) -> list[Tool]:
+    # None keeps the server default, which SQLite stores without a fraction of a second
+    tools = [Tool(name=f"Tool {i}", slug=f"tool-{i}", **({"created_at": value} if value else {}))
+             for i, value in enumerate(created_at)]
+    db.add_all(tools)
+    db.commit()
+    return tools
+
+
+def walk(db, descending: bool, limit: int = 2) -> list[str]:
+    slugs, cursor = [], None
+    while True:
+        page = crud_pagination.paginate(db, select(Tool), Tool, (Tool.created_at,), limit=limit, cursor=cursor,
+                                        descending=descending)
+        slugs += [tool.slug for tool in page.items]
+        assert len(slugs) <= 20, "pagination is not advancing"
+        if page.next_cursor is None:
+            return slugs
+        cursor = page.next_cursor
+
+
+def expected_order(tools: list[Tool], descending: bool) -> list[str]:
+    ordered = sorted(tools, key=lambda tool: (tool.created_at, tool.id), reverse=descending)
+    return [tool.slug for tool in ordered]
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("created_at", [
+    pytest.param([None] * 5, id="server-default-ties"),
+    pytest.param([WHOLE_SECOND] * 5, id="whole-second-ties"),
+    pytest.param([WHOLE_SECOND.replace(second=i) for i in range(5)], id="whole-seconds"),
+    pytest.param([WHOLE_SECOND.replace(second=i // 2, microsecond=250000 * (i % 2)) for i in range(6)],
+                 id="mixed-fractions"),
+])
+def test_cursor_pages_cover_every_row_once(db, created_at, descending):
+    tools = add_tools(db, created_at)
+
+    assert walk(db, descending) == expected_order(tools, descending)
+
+
+def test_cursor_survives_deleting_its_row(db):
+    tools = add_tools(db, [None] * 6)
+    ids = [tool.id for tool in tools]
+    first = crud_tool.get_tools(db, limit=3)
+    db.delete(first.items[-1])
+    db.commit()
+
+    second = crud_tool.get_tools(db, limit=3, cursor=first.next_cursor)
+
+    assert [tool.id for tool in second.items] == ids[3:]
@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.api.v1.endpoints import auth
+from app.core.exceptions import PasswordHasherBusyError
+from app.core.security import PasswordHasher, get_password_hash
+from app.models.user import User
+
+
+def metric(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def saturated_hasher():
+    """A one-worker pool with no queue whose only worker is blocked until the test ends."""
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    release, started = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    future = hasher._submit(block)
+    started.wait(5)
+    yield hasher
+    release.set()
+    future.result()
+
+
+def test_full_pool_rejects_and_exports_its_state(saturated_hasher):
+    rejected = metric("password_hashes_rejected_total")
+
+    assert metric("password_hashes_in_flight", state="running") >= 1
+    with pytest.raises(PasswordHasherBusyError):
+        saturated_hasher.hash_sync("secret")
+
+    assert metric("password_hashes_rejected_total") == rejected + 1
+    assert saturated_hasher.stats().rejected == 1
+
+
+def test_completed_hashes_record_their_duration():
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+    count = metric("password_hash_duration_seconds_count")
+
+    hasher.verify_sync("secret", get_password_hash("secret"))
+
+    assert metric("password_hash_duration_seconds_count") >= count + 1
+    assert hasher.stats().completed == 1
+
+
+def test_login_answers_503_when_the_pool_is_busy(client, db, saturated_hasher, monkeypatch):
+    db.add(User(email="reader@example.com", hashed_password=get_password_hash("Secret1!"), is_active=True))
+    db.commit()
+    monkeypatch.setattr(auth, "password_hasher", saturated_hasher)
+
+    response = client.post("/api/v1/auth/token", data={"username": "reader@example.com", "password": "Secret1!"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
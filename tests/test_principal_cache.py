@@ -0,0 +1,29 @@
+from app.core.security import principal_cache
+
+
+def test_deactivating_a_user_invalidates_the_cached_principal(client, login):
+    _, admin_headers = login("admin@example.com", is_superuser=True)
+    user, headers = login()
+    assert client.get("/api/v1/carts/me", headers=headers).status_code == 200
+    assert principal_cache.get(user.email)["is_active"] is True
+
+    response = client.put(f"/api/v1/users/{user.id}", json={"email": user.email, "is_active": False},
+                          headers=admin_headers)
+
+    assert response.status_code == 200
+    assert principal_cache.get(user.email) is None
+    # Logout requires an active user
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 400
+
+
+def test_changing_privileges_invalidates_the_cached_principal(client, login):
+    admin, admin_headers = login("admin@example.com", is_superuser=True)
+    assert client.get("/api/v1/users/", headers=admin_headers).status_code == 200
+
+    response = client.put(f"/api/v1/users/{admin.id}", json={"email": admin.email, "is_superuser": False,
+                                                               "roles": "editor"}, headers=admin_headers)
+
+    assert response.status_code == 200
+    assert client.get("/api/v1/users/", headers=admin_headers).status_code == 403
+    cached = principal_cache.get(admin.email)
+    assert (cached["is_superuser"], cached["roles"]) == (False, "editor")
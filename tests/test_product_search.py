@@ -0,0 +1,79 @@
+from app.crud import crud_product
+from app.models.category import Category
+from app.models.tag import Tag
+from app.schemas.product import ProductCreate, ProductUpdate
+
+
+def counts(body, facet):
+    return {item["value"]: item["count"] for item in body["facets"][facet]}
+
+
+def seed(db):
+    fiction = Category(name="Fiction", slug="fiction")
+    db.add(fiction)
+    db.flush()
+    fantasy = Category(name="Fantasy", slug="fantasy", parent_id=fiction.id)
+    science = Category(name="Science", slug="science")
+    classic, new = Tag(name="Classic", slug="classic"), Tag(name="New", slug="new")
+    db.add_all([fantasy, science, classic, new])
+    db.commit()
+    books = [
+        ("a", 5, "en", [fiction.id], [classic.id]),
+        ("b", 15, "en", [fantasy.id], [classic.id, new.id]),
+        ("c", 30, "de", [fantasy.id], [new.id]),
+        ("d", 75, "en", [science.id], []),
+        ("e", 150, "de", [science.id], [classic.id]),
+    ]
+    for slug, price, language, category_ids, tag_ids in books:
+        crud_product.create_product(db, ProductCreate(title=slug, slug=slug, price=price, language=language,
+                                                      category_ids=category_ids, tag_ids=tag_ids))
+
+
+def test_unfiltered_facets_count_every_product(client, db):
+    seed(db)
+    body = client.get("/api/v1/products/search").json()
+
+    assert body["total"] == 5
+    assert counts(body, "price") == {"0-10": 1, "10-25": 1, "25-50": 1, "50-100": 1, "100-": 1}
+    assert counts(body, "category") == {"fantasy": 2, "fiction": 1, "science": 2}
+    assert counts(body, "tag") == {"classic": 3, "new": 2}
+    assert counts(body, "language") == {"en": 3, "de": 2}
+
+
+def test_each_facet_applies_every_filter_but_its_own(client, db):
+    seed(db)
+    body = client.get("/api/v1/products/search", params={"category": "fiction", "tag": "classic"}).json()
+
+    # "fiction" includes its "fantasy" subcategory: a and b match both filters
+    assert body["total"] == 2
+    assert {item["slug"] for item in body["items"]} == {"a", "b"}
+    assert counts(body, "price") == {"0-10": 1, "10-25": 1}
+    # Category counts ignore the category filter but keep the tag filter: a, b and e are classics
+    assert counts(body, "category") == {"fiction": 1, "fantasy": 1, "science": 1}
+    # Tag counts ignore the tag filter but keep the category filter: a, b and c are fiction
+    assert counts(body, "tag") == {"classic": 2, "new": 2}
+
+
+def test_price_filter_narrows_other_facets_but_not_price_buckets(client, db):
+    seed(db)
+    body = client.get("/api/v1/products/search", params={"min_price": 10, "max_price": 50}).json()
+
+    assert body["total"] == 2
+    assert counts(body, "price") == {"0-10": 1, "10-25": 1, "25-50": 1, "50-100": 1, "100-": 1}
+    assert counts(body, "category") == {"fantasy": 2}
+    assert counts(body, "language") == {"en": 1, "de": 1}
+
+
+def test_product_writes_invalidate_cached_facets(client, db):
+    seed(db)
+    assert client.get("/api/v1/products/search").json()["total"] == 5
+
+    crud_product.create_product(db, ProductCreate(title="f", slug="f", price=8, language="fr"))
+    created = client.get("/api/v1/products/search").json()
+    assert created["total"] == 6
+    assert counts(created, "price")["0-10"] == 2
+
+    crud_product.update_product(db, crud_product.get_product(db, slug="f"), ProductUpdate(price=200))
+    updated = client.get("/api/v1/products/search").json()
+    assert counts(updated, "price")["0-10"] == 1
+    assert counts(updated, "price")["100-"] == 2
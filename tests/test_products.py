@@ -0,0 +1,21 @@
+from app.core.security import get_password_hash
+from app.crud import crud_review
+from app.models.product import Product
+from app.models.user import User
+from app.schemas.review import ReviewCreate
+
+
+def test_review_write_changes_product_etag(client, db):
+    user = User(email="reader@example.com", hashed_password=get_password_hash("secret"))
+    product = Product(title="Book", slug="book", language="en")
+    db.add_all([user, product])
+    db.commit()
+    first = client.get("/api/v1/products/book")
+
+    crud_review.create_review(db, ReviewCreate(product_id=product.id, user_id=user.id, rating=4))
+    second = client.get("/api/v1/products/book", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.json()["rating_count"] == 0
+    assert second.status_code == 200
+    assert second.json()["rating_count"] == 1
+    assert second.headers["ETag"] != first.headers["ETag"]
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.query_stats import assert_max_queries
+from app.models.article import Article
+from app.models.category import Category
+from app.models.tag import Tag
+
+# Page validators, the page itself, then one select-in load each for categories, tags and image derivatives
+ARTICLE_LIST_QUERIES = 5
+
+
+def add_articles(db, count: int) -> None:
+    categories = [Category(name=f"Category {i}", slug=f"category-{i}") for i in range(3)]
+    tags = [Tag(name=f"Tag {i}", slug=f"tag-{i}") for i in range(3)]
+    published_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        db.add(Article(
+            type="blog", title=f"Article {i}", slug=f"article-{i}", status="published",
+            published_at=published_at + timedelta(hours=i),
+            categories=[categories[i % 3]], tags=[tags[i % 3], tags[(i + 1) % 3]],
+        ))
+    db.commit()
+
+
+@pytest.mark.parametrize("limit", [5, 50])
+def test_article_list_query_count_does_not_grow_with_page_size(client, db, limit):
+    add_articles(db, 60)
+
+    with assert_max_queries(ARTICLE_LIST_QUERIES) as stats:
+        response = client.get("/api/v1/articles/", params={"limit": limit})
+
+    assert response.status_code == 200
+    assert len(response.json()) == limit
+    assert all(article["category_ids"] and article["tag_ids"] for article in response.json())
+    assert stats.count == ARTICLE_LIST_QUERIES
@@ -0,0 +1,79 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.middleware import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, QueryStatsMiddleware
+from app.core.query_stats import assert_max_queries
+from app.models.article import Article
+
+
+def test_assert_max_queries_passes_within_limit(db):
+    with assert_max_queries(1) as stats:
+        db.execute(select(Article.id)).all()
+
+    assert stats.count == 1
+
+
+def test_assert_max_queries_raises_when_limit_exceeded(db):
+    with pytest.raises(AssertionError, match=r"Expected at most 1 queries, 2 ran") as excinfo:
+        with assert_max_queries(1):
+            db.execute(select(Article.id)).all()
+            db.execute(select(Article.id)).all()
+
+    assert "2 x SELECT articles.id FROM articles" in str(excinfo.value)
+
+
+def stats_client(debug: bool) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, debug=debug)
+
+    @app.get("/repeat/{times}")
+    def repeat(times: int):
+        with SessionLocal() as db:
+            for article_id in range(times):
+                db.execute(select(Article.id).where(Article.id == article_id)).all()
+        return {}
+
+    return TestClient(app)
+
+
+def test_debug_headers_report_query_count_and_time():
+    response = stats_client(debug=True).get("/repeat/3")
+
+    assert response.headers[QUERY_COUNT_HEADER] == "3"
+    assert float(response.headers[QUERY_TIME_HEADER]) > 0
+
+
+def test_debug_headers_are_off_by_default():
+    response = stats_client(debug=False).get("/repeat/3")
+
+    assert QUERY_COUNT_HEADER not in response.headers
+    assert QUERY_TIME_HEADER not in response.headers
+
+
+def n_plus_one_warnings(caplog) -> list[str]:
+    return [record.getMessage() for record in caplog.records if "Possible N+1" in record.getMessage()]
+
+
+def test_statement_repeated_past_the_threshold_warns_once(caplog):
+    caplog.set_level(logging.WARNING, logger="app.core.query_stats")
+
+    stats_client(debug=False).get(f"/repeat/{settings.N_PLUS_ONE_THRESHOLD + 5}")
+
+    warnings = n_plus_one_warnings(caplog)
+    assert len(warnings) == 1
+    assert f"ran {settings.N_PLUS_ONE_THRESHOLD + 1} times" in warnings[0]
+    assert "FROM articles WHERE articles.id = ?" in warnings[0]
+
+
+def test_statement_repeated_up_to_the_threshold_does_not_warn(caplog):
+    caplog.set_level(logging.WARNING, logger="app.core.query_stats")
+
+    stats_client(debug=False).get(f"/repeat/{settings.N_PLUS_ONE_THRESHOLD}")
+
+    assert n_plus_one_warnings(caplog) == []
@@ -0,0 +1,67 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import ip_filter
+from app.core.ip_filter import IPRangeSet, parse_network
+from app.core.kv_store import MemoryStore
+from app.core.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def limiter():
+    return RateLimiter(limit=2, window=60, scope="test", store=MemoryStore())
+
+
+def limited_client(limiter: RateLimiter, peer: str = "203.0.113.1") -> TestClient:
+    app = FastAPI()
+
+    @app.get("/limited", dependencies=[Depends(limiter)])
+    def limited():
+        return {}
+
+    return TestClient(app, client=(peer, 50000))
+
+
+def test_window_rollover_forgets_old_requests(limiter):
+    start = 6000.0
+    assert limiter.hit("client", now=start) == 0
+    assert limiter.hit("client", now=start + 1) == 0
+    assert limiter.hit("client", now=start + 2) == 58
+
+    # Rejected requests count too; a quarter of the previous window still overlaps: 3 * 0.25 + 1 fits
+    assert limiter.hit("client", now=start + 105) == 0
+    # Two windows later the old counts no longer weigh at all
+    assert limiter.hit("client", now=start + 180) == 0
+    assert limiter.hit("client", now=start + 181) == 0
+
+
+def test_exceeding_the_limit_returns_429_with_retry_after(limiter):
+    client = limited_client(limiter)
+
+    statuses = [client.get("/limited").status_code for _ in range(3)]
+    response = client.get("/limited")
+
+    assert statuses == [200, 200, 429]
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 60
+
+
+def test_clients_are_limited_separately(limiter):
+    first, second = limited_client(limiter, "203.0.113.1"), limited_client(limiter, "203.0.113.2")
+
+    assert [first.get("/limited").status_code for _ in range(3)] == [200, 200, 429]
+    assert second.get("/limited").status_code == 200
+
+
+def test_clients_behind_a_trusted_proxy_are_limited_separately(limiter, monkeypatch):
+    monkeypatch.setattr(ip_filter, "trusted_proxies", IPRangeSet([parse_network("10.0.0.1")]))
+    proxy = limited_client(limiter, "10.0.0.1")
+
+    for _ in range(2):
+        proxy.get("/limited", headers={"X-Forwarded-For": "198.51.100.1"})
+    blocked = proxy.get("/limited", headers={"X-Forwarded-For": "198.51.100.1"})
+    other = proxy.get("/limited", headers={"X-Forwarded-For": "198.51.100.2"})
+
+    assert blocked.status_code == 429
+    assert other.status_code == 200
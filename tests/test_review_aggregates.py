@@ -0,0 +1,40 @@
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.crud import crud_review
+from app.models.product import Product
+from app.models.review import Review
+from app.models.user import User
+from app.schemas.review import ReviewCreate, ReviewUpdate
+
+
+def add_review(db, rating: int) -> Review:
+    user = User(email="reader@example.com", hashed_password=get_password_hash("secret"))
+    product = Product(title="Book", slug="book", language="en")
+    db.add_all([user, product])
+    db.commit()
+    return crud_review.create_review(db, ReviewCreate(product_id=product.id, user_id=user.id, rating=rating))
+
+
+def aggregates(db, product_id: int) -> tuple:
+    product = db.get(Product, product_id, populate_existing=True)
+    return product.rating_count, product.rating_sum, product.rating_avg, product.rating_4, product.rating_5
+
+
+def test_deleting_a_review_twice_removes_its_rating_once(db):
+    review = add_review(db, 5)
+    with SessionLocal() as other:
+        stale = crud_review.get_review(other, review.id)
+        assert crud_review.delete_review(db, review)
+        assert not crud_review.delete_review(other, stale)
+
+    assert aggregates(db, review.product_id) == (0, 0, 0.0, 0, 0)
+
+
+def test_updating_a_stale_review_moves_the_stored_rating(db):
+    review = add_review(db, 5)
+    with SessionLocal() as other:
+        stale = crud_review.get_review(other, review.id)
+        crud_review.update_review(db, review, ReviewUpdate(rating=4))
+        crud_review.update_review(other, stale, ReviewUpdate(rating=5))
+
+    assert aggregates(db, review.product_id) == (1, 5, 5.0, 0, 1)
@@ -0,0 +1,37 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.kv_store import MemoryStore
+from app.core.security import TokenBlacklist
+
+
+def test_revoked_token_is_rejected(client, login):
+    _, headers = login()
+    assert client.get("/api/v1/carts/me", headers=headers).status_code == 200
+
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+
+    assert client.get("/api/v1/carts/me", headers=headers).status_code == 401
+
+
+def test_revocation_lasts_for_the_token_remaining_lifetime():
+    store = MemoryStore()
+    blacklist = TokenBlacklist(store)
+
+    blacklist.add_to_blacklist("long", datetime.now(timezone.utc) + timedelta(minutes=2))
+    blacklist.add_to_blacklist("short", datetime.now(timezone.utc) + timedelta(seconds=0.05))
+
+    (expires_at,) = [expiry for key, (_, expiry) in store._data.items() if key.endswith(":long")]
+    assert 118 <= expires_at - time.monotonic() <= 120
+    assert blacklist.is_blacklisted("short")
+    time.sleep(0.15)
+    assert not blacklist.is_blacklisted("short")
+    assert blacklist.is_blacklisted("long")
+
+
+def test_expired_tokens_are_not_stored():
+    store = MemoryStore()
+
+    TokenBlacklist(store).add_to_blacklist("old", datetime.now(timezone.utc) - timedelta(seconds=1))
+
+    assert len(store) == 0
@@ -0,0 +1,108 @@
+import gzip
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.exceptions import UploadTooLargeError
+from app.core.static_files import IMMUTABLE, UploadStaticFiles
+from app.core.storage import LocalStorage
+
+TEXT = b"".join(f"line {i}: the same words again and again\n".encode() for i in range(200))
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(tmp_path)
+
+
+@pytest.fixture
+def static_client(storage):
+    app = FastAPI()
+    app.mount("/uploads", UploadStaticFiles(directory=str(storage.root)))
+    return TestClient(app)
+
+
+def test_identical_uploads_share_one_object(storage):
+    first = storage.save(io.BytesIO(b"same bytes"), ".bin")
+    second = storage.save(io.BytesIO(b"same bytes"), ".bin")
+
+    assert first.key == second.key
+    assert first.sha256 == hashlib.sha256(b"same bytes").hexdigest()
+    assert (first.created, second.created) == (True, False)
+    assert storage.path(first.key).read_bytes() == b"same bytes"
+    assert list(storage.temp_dir.iterdir()) == []
+
+
+def test_oversized_upload_leaves_nothing_behind(storage):
+    with pytest.raises(UploadTooLargeError):
+        storage.save(io.BytesIO(b"x" * 100), ".bin", max_size=10)
+
+    assert list(storage.temp_dir.iterdir()) == []
+    assert [path.name for path in storage.root.iterdir()] == [".tmp"]
+
+
+def test_text_uploads_get_a_gzip_sibling(storage):
+    text = storage.save(io.BytesIO(TEXT), ".txt")
+    image = storage.save(io.BytesIO(TEXT), ".png")
+
+    assert gzip.decompress(storage.path(f"{text.key}.gz").read_bytes()) == TEXT
+    assert not storage.path(f"{image.key}.gz").exists()
+
+    storage.delete(text.key)
+    assert not storage.path(f"{text.key}.gz").exists()
+
+
+def test_content_addressed_files_are_immutable_with_hash_etags(static_client, storage):
+    stored = storage.save(io.BytesIO(b"\x89PNG image"), ".png")
+
+    response = static_client.get(stored.url, headers={"Accept-Encoding": "identity"})
+
+    assert response.content == b"\x89PNG image"
+    assert response.headers["Cache-Control"] == IMMUTABLE
+    assert response.headers["ETag"] == f'"{stored.sha256}"'
+    revalidated = static_client.get(stored.url, headers={"If-None-Match": response.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_other_files_must_revalidate(static_client, storage):
+    (storage.root / "robots.txt").write_text("User-agent: *\n")
+
+    response = static_client.get("/uploads/robots.txt")
+
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert static_client.get("/uploads/robots.txt", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+
+def test_gzip_sibling_is_served_to_clients_that_accept_it(static_client, storage):
+    stored = storage.save(io.BytesIO(TEXT), ".txt")
+
+    compressed = static_client.get(stored.url, headers={"Accept-Encoding": "gzip"})
+    plain = static_client.get(stored.url, headers={"Accept-Encoding": "identity"})
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["ETag"] == f'"{stored.sha256}-gzip"'
+    assert int(compressed.headers["Content-Length"]) < len(TEXT)
+    assert compressed.content == TEXT  # decoded by the client
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["Vary"] == "Accept-Encoding"
+
+
+def test_ranges_are_served_from_the_uncompressed_file(static_client, storage):
+    stored = storage.save(io.BytesIO(TEXT), ".txt")
+
+    response = static_client.get(stored.url, headers={"Range": "bytes=5-14", "Accept-Encoding": "gzip"})
+
+    assert response.status_code == 206
+    assert response.content == TEXT[5:15]
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Content-Range"] == f"bytes 5-14/{len(TEXT)}"
+
+
+def test_temporary_files_are_never_served(static_client, storage):
+    storage.temp_dir.mkdir(parents=True, exist_ok=True)
+    (storage.temp_dir / "upload.part").write_bytes(b"partial")
+
+    assert static_client.get("/uploads/.tmp/upload.part").status_code == 404